@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# __author__ = 'XingHuan'
+
+"""
+Build the node graph of a usd file without a window, apply edit scripts and export the result.
+The edit scripts and saved graphs are json in the format of GraphicsScene.getSelectedNodesAsString,
+the inputs of their nodes can connect to the nodes of the loaded layer by name.
+
+    usdnodegraph_batch shot.usda -s edit.json -o shot_edit.usda
+    usdnodegraph_batch -g graph.json -o out.usda
+
+The nodes are still Qt objects, so a QApplication is created on the 'offscreen' platform,
+no display is needed.
+"""
+
+
+import os
+import sys
+import argparse
+import logging
+from pxr import Usd, Sdf
+
+
+logger = logging.getLogger('usdNodeGraph.batch')
+
+
+def createApplication():
+    from usdNodeGraph.module.sqt import QApplication
+
+    app = QApplication.instance()
+    if app is None:
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        app = QApplication([sys.argv[0]])
+    return app
+
+
+def createScene(usdFile=None):
+    """
+    :param usdFile: the file opened as the stage of the nodes, an anonymous layer is used if None
+    :return: GraphicsScene without view and nodes
+    """
+    from usdNodeGraph.ui.graph.view import GraphicsScene
+
+    if usdFile is not None:
+        if not os.path.isfile(usdFile):
+            raise IOError('Can\'t find usd file: {}'.format(usdFile))
+        stage = Usd.Stage.Open(usdFile)
+    else:
+        stage = Usd.Stage.Open(Sdf.Layer.CreateAnonymous('.usda'))
+
+    scene = GraphicsScene()
+    scene.setStage(stage, reset=False)
+    return scene
+
+
+def loadLayer(scene):
+    scene.resetScene(background=False)
+
+
+def applyScript(scene, nodesString):
+    nodes = scene.pasteNodesFromString(nodesString)
+    if nodes is None:
+        raise ValueError('Not a valid nodes json')
+    return nodes
+
+
+def loadGraph(scene, nodesString):
+    """
+    create the nodes of a saved graph, which has its Root node, instead of the nodes of the layer
+    """
+    nodes = applyScript(scene, nodesString)
+    rootNodes = [node for node in nodes if node.nodeType == 'Root']
+    if len(rootNodes) == 0:
+        raise ValueError('No Root node in the graph')
+    scene.rootNode = rootNodes[0]
+    return nodes
+
+
+def _readFile(path):
+    with open(path) as f:
+        return f.read()
+
+
+def run(outputFile, usdFile=None, graphFile=None, scriptFiles=()):
+    """
+    :return: the executed stage
+    """
+    createApplication()
+
+    scene = createScene(usdFile)
+    if graphFile is not None:
+        loadGraph(scene, _readFile(graphFile))
+    else:
+        loadLayer(scene)
+    for scriptFile in scriptFiles:
+        applyScript(scene, _readFile(scriptFile))
+
+    stage = scene.exportAllToFile(outputFile)
+    if stage is None:
+        raise RuntimeError('Can\'t execute the graph')
+
+    logger.info('exported: {}'.format(outputFile))
+    return stage
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build and execute a usdNodeGraph graph without a window.')
+    parser.add_argument('usdFile', nargs='?', help='usd file to load into the graph')
+    parser.add_argument('-g', '--graph', help='saved graph json, used instead of the nodes of usdFile')
+    parser.add_argument('-s', '--script', action='append', default=[],
+                        help='edit script json applied to the graph, can be given more than once')
+    parser.add_argument('-o', '--output', required=True, help='file to export the executed layer to')
+    args = parser.parse_args(argv)
+
+    if args.usdFile is None and args.graph is None:
+        parser.error('a usdFile or a --graph is required')
+
+    try:
+        run(args.output, usdFile=args.usdFile, graphFile=args.graph, scriptFiles=args.script)
+    except (IOError, ValueError, RuntimeError) as e:
+        logger.error(e)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -15,3 +15,9 @@ DEFAULT_COLOR = [210, 210, 210]
 DEFAULT_LABEL_COLOR = QColor(200, 200, 200)
 PORT_SPACING = 20
 
+# level of detail tiers, from the zoom of view
+LOD_FULL = 0
+LOD_SIMPLE = 1
+LOD_BATCH = 2
+LOD_SIMPLE_ZOOM = 0.3
+LOD_BATCH_ZOOM = 0.1
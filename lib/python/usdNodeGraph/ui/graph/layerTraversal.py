@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+# __author__ = 'XingHuan'
+
+"""
+Walk the prim specs of a layer and describe the nodes which show them.
+Only the layer is read here, no item is created, so the walk can be done
+in a thread while the scene creates the items of the description.
+"""
+
+
+import re
+from pxr import Sdf
+from usdNodeGraph.module.sqt import QThread
+from .const import Const
+
+
+VARIANT_PRIM_PATH_PATTERN = re.compile('.*{(?P<variantSet>.+)=(?P<variant>.+)}$')
+
+# the upKey of a node which connects to the upNode given to the scene builder
+UP_NODE_KEY = -1
+
+
+class LayerTraversal(object):
+    """
+    self.nodes is a list of (nodeClass, kwargs, upKey, index, primPath),
+    upKey is the position of the node to connect to in the list (or UP_NODE_KEY / None),
+    primPath is set for the prim nodes.
+    """
+
+    def __init__(self, lazyPopulate=False):
+        self.lazyPopulate = lazyPopulate
+        self.nodes = []
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def _addNode(self, nodeClass, upKey, index=0, primPath=None, **kwargs):
+        self.nodes.append((nodeClass, kwargs, upKey, index, primPath))
+        return len(self.nodes) - 1
+
+    def _isCollapsedDepth(self, depth):
+        return self.lazyPopulate and depth >= Const.populate_depth
+
+    def _getPrim(self, prim, upKey, index=0, depth=0):
+        skipAttribute = False
+
+        primPath = prim.path.pathString
+        match = re.match(VARIANT_PRIM_PATH_PATTERN, primPath)
+        if match:
+            upKey = self._addNode(
+                'VariantSwitch', upKey, index=index,
+                variantSetName=match.group('variantSet'),
+                variantSelected=match.group('variant')
+            )
+        else:
+            # prim define
+            specifier = prim.specifier
+            if specifier == Sdf.SpecifierDef:
+                typeName = prim.typeName
+                if typeName in ['Material', 'Shader']:
+                    upKey = self._addNode(typeName, upKey, index=index, primPath=primPath, name=prim.name, prim=prim)
+                    skipAttribute = True
+                else:
+                    upKey = self._addNode('PrimDefine', upKey, index=index, primPath=primPath, prim=prim)
+            elif specifier == Sdf.SpecifierOver:
+                upKey = self._addNode('PrimOverride', upKey, index=index, primPath=primPath, prim=prim)
+            else:
+                return upKey
+
+        # reference
+        referenceList = prim.referenceList.GetAddedOrExplicitItems()
+        for reference in referenceList:
+            upKey = self._addNode('Reference', upKey, reference=reference)
+
+        # payload
+        payloadList = prim.payloadList.GetAddedOrExplicitItems()
+        for payload in payloadList:
+            upKey = self._addNode('Payload', upKey, payload=payload)
+
+        # attribute
+        if not skipAttribute:
+            upKey = self._getPrimAttributes(prim, upKey)
+
+        # relationship
+        upKey = self._getPrimRelationships(prim, upKey)
+
+        # variant
+        selectedVariantDict = {}
+        variantSetNameList = prim.variantSetNameList
+        variantSetNameItems = variantSetNameList.GetAddedOrExplicitItems()
+        variantSelections = prim.variantSelections
+        if len(variantSetNameItems) > 0:
+            variantSets = prim.variantSets
+            for variantSetName, variantSetSpec in variantSets.items():
+                variantSetKey = self._addNode('VariantSet', upKey, variantSet=variantSetSpec)
+
+                variantSelected = variantSelections.get(variantSetName)
+                variantSelectKey = self._addNode(
+                    'VariantSelect', variantSetKey,
+                    variantSetName=variantSetName,
+                    variantSelected=variantSelected,
+                    prim=prim
+                )
+                selectedVariantDict.update({variantSetName: variantSelected})
+
+                variantList = variantSetSpec.variantList
+                for i, variantSpec in enumerate(variantList):
+                    variantPrim = variantSpec.primSpec
+                    self.traverse(variantPrim, upKey=variantSelectKey, index=i, depth=depth)
+
+        for variantSetName, variantSelected in variantSelections.items():
+            if not variantSetName in selectedVariantDict:
+                self._addNode(
+                    'VariantSelect', upKey,
+                    variantSetName=variantSetName,
+                    variantSelected=variantSelected,
+                    prim=prim
+                )
+
+        return upKey
+
+    def _getPrimAttributes(self, prim, upKey, index=0):
+        if len(prim.attributes.keys()) == 0:
+            return upKey
+
+        return self._addNode('AttributeSet', upKey, index=index, prim=prim)
+
+    def _getPrimRelationships(self, prim, upKey, index=0):
+        if len(prim.relationships.keys()) == 0:
+            return upKey
+
+        if 'material:binding' in prim.relationships.keys():
+            relationship = prim.relationships.get('material:binding')
+            material = relationship.targetPathList.GetAddedOrExplicitItems()[0].pathString
+            upKey = self._addNode('MaterialAssign', upKey, index=index, material=material)
+
+            if len(prim.relationships.keys()) == 1:  # only material:binding
+                return upKey
+
+        return self._addNode('RelationshipSet', upKey, index=index, prim=prim)
+
+    def traverse(self, prim, upKey=UP_NODE_KEY, index=0, depth=0):
+        """
+        describe the nodes of prim and its children
+        :return: the children count, used as the index of the next sibling
+        """
+        if self.cancelled:
+            return 0
+
+        childrenCount = 0
+
+        primPath = prim.path
+        key = upKey
+        if primPath != '/':
+            key = self._getPrim(prim, upKey, index, depth)
+        if len(prim.nameChildren) > 0 and self._isCollapsedDepth(depth):
+            # children will be populated when the collapsed node is expanded
+            self._addNode('Collapsed', key, prim=prim)
+            return 1
+        for childName, child in prim.nameChildren.items():
+            currentChildCount = self.traverse(child, key, childrenCount, depth + 1)
+            if currentChildCount > 1:
+                childrenCount += currentChildCount
+            else:
+                childrenCount += 1
+
+        return childrenCount
+
+    def traverseChildren(self, prim, depth=1):
+        childrenCount = 0
+        for childName, child in prim.nameChildren.items():
+            currentChildCount = self.traverse(child, UP_NODE_KEY, childrenCount, depth=depth)
+            if currentChildCount > 1:
+                childrenCount += currentChildCount
+            else:
+                childrenCount += 1
+        return childrenCount
+
+
+class LayerTraversalThread(QThread):
+    def __init__(self, traversal, prim, parent=None):
+        super(LayerTraversalThread, self).__init__(parent)
+
+        self.traversal = traversal
+        self.prim = prim
+
+    def run(self):
+        self.traversal.traverse(self.prim)
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# __author__ = 'XingHuan'
+
+"""
+Node label templates, like '/[value primName]' or
+'[python os.path.basename("[value assetPath]")]'.
+A template is parsed once, and the [python ...] results are kept per expression.
+"""
+
+
+import re
+import os
+
+
+EXPRESSION_VALUE_PATTERN = re.compile(r'\[value ([^\[\]]+)\]')
+EXPRESSION_PYTHON_PATTERN = re.compile(r'\[python ([^\[\]]+)\]')
+
+# the label expressions are expected to be pure, so a result only depends on the expression string
+PYTHON_CACHE_SIZE = 10000
+
+_templates = {}
+_pythonResults = {}
+
+
+def _evalPython(pyString):
+    if pyString in _pythonResults:
+        return _pythonResults[pyString]
+
+    try:
+        result = str(eval(pyString))
+    except:
+        result = None
+
+    if len(_pythonResults) >= PYTHON_CACHE_SIZE:
+        _pythonResults.clear()
+    _pythonResults[pyString] = result
+    return result
+
+
+def _replacePython(match):
+    result = _evalPython(match.group(1))
+    if result is None:
+        return match.group(0)
+    return result
+
+
+class LabelTemplate(object):
+    __slots__ = ('_parts', 'parameterNames')
+
+    def __init__(self, template):
+        # the odd parts are the parameter names of the [value ...]
+        self._parts = EXPRESSION_VALUE_PATTERN.split(template)
+        self.parameterNames = frozenset(self._parts[1::2])
+
+    def dependsOn(self, parameterName):
+        return parameterName in self.parameterNames
+
+    def render(self, node):
+        """
+        :param node: the node item, which gives the parameters
+        :return: label string
+        """
+        parts = []
+        for index, part in enumerate(self._parts):
+            if index % 2 == 0:
+                parts.append(part)
+                continue
+            param = node.parameter(part)
+            if param is None:
+                parts.append('[value {}]'.format(part))
+            else:
+                parts.append(str(param.getValue()))
+        label = ''.join(parts)
+
+        if '[python ' in label:
+            label = EXPRESSION_PYTHON_PATTERN.sub(_replacePython, label)
+        return label
+
+
+def getLabelTemplate(template):
+    labelTemplate = _templates.get(template)
+    if labelTemplate is None:
+        labelTemplate = LabelTemplate(template)
+        _templates[template] = labelTemplate
+    return labelTemplate
@@ -53,6 +53,7 @@ class Node(QObject):
         super(Node, self).__init__()
 
         self.item = item
+        self._parameterSlots = {}
 
         self._initParameters()
         self._initDefaults()
@@ -98,6 +99,24 @@ class Node(QObject):
         if name == 'y':
             return self.item.scenePos().y()
 
+    def _connectParameter(self, parameter, slot):
+        self._parameterSlots.setdefault(parameter, []).append(slot)
+
+    def _disconnectParameter(self, parameter, slot):
+        slots = self._parameterSlots.get(parameter, [])
+        if slot in slots:
+            slots.remove(slot)
+        if len(slots) == 0:
+            self._parameterSlots.pop(parameter, None)
+
+    def _emitParameterValueChanged(self, parameter, value):
+        """
+        the parameters are not QObjects, their changes are sent by the node
+        """
+        self._paramterValueChanged(parameter, value)
+        for slot in self._parameterSlots.get(parameter, [])[::]:
+            slot(parameter, value)
+
     def _paramterValueChanged(self, parameter, value):
         self.parameterValueChanged.emit(parameter, value)
         if parameter.name() == 'name':
@@ -136,8 +155,9 @@ class Node(QObject):
 
     def removeParameter(self, parameterName):
         if parameterName in self._parameters:
-            # parameter = self.parameter(parameterName)
-            self._parameters.pop(parameterName)
+            parameter = self._parameters.pop(parameterName)
+            # the slots would keep the removed parameter and the widgets alive
+            self._parameterSlots.pop(parameter, None)
             self.parameterRemoved.emit(parameterName)
 
 
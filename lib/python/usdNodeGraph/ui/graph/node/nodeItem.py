@@ -6,21 +6,18 @@
 from usdNodeGraph.module.sqt import *
 from .port import InputPort, OutputPort, Port
 from .tag import PixmapTag
+from .labelTemplate import getLabelTemplate
 from ..const import *
 from usdNodeGraph.ui.parameter.parameter import (
     Parameter, TextParameter, FloatParameter, StringParameter, BoolParameter
 )
 import time
-import re
-import os
 
 
 NAME_FONT = QFont('Arial', 10, italic=True)
 NAME_FONT.setBold(True)
 LABEL_FONT = QFont('Arial', 10)
 
-EXPRESSION_VALUE_PATTERN = re.compile(r'\[value [^\[\]]+\]')
-EXPRESSION_PYTHON_PATTERN = re.compile(r'\[python [^\[\]]+\]')
 
 
 class _BaseNodeItem(QGraphicsItem):
@@ -39,10 +36,15 @@ class _BaseNodeItem(QGraphicsItem):
 
         self.setFlag(QGraphicsItem.ItemIsMovable, True)
         self.setFlag(QGraphicsItem.ItemIsSelectable, True)
+        self.setFlag(QGraphicsItem.ItemSendsGeometryChanges, True)
         self.setAcceptHoverEvents(True)
 
         self.pipes = []
         self.ports = []
+        self.tags = []
+
+        self._labelVisible = False
+        self._portsLabelVisible = False
 
         self.margin = 6
         self.roundness = 10
@@ -83,7 +85,8 @@ class _BaseNodeItem(QGraphicsItem):
     def toDict(self):
         nodeName = self.parameter('name').getValue()
         paramsDict = {}
-        for paramName, param in self.nodeObject._parameters.items():
+        for param in self.nodeObject.parameters():
+            paramName = param.name()
             if paramName != 'name':
                 builtIn = param.isBuiltIn()
                 visible = param.isVisible()
@@ -168,9 +171,16 @@ class _BaseNodeItem(QGraphicsItem):
             self.setY(value)
         if parameter.name() == 'disable':
             self._updateDisableItem()
-        self._updateUI()
+        self._updateUI(parameter)
+
+    def isLabelVisible(self):
+        return self._labelVisible
+
+    def isPortsLabelVisible(self):
+        return self._portsLabelVisible
 
     def setLabelVisible(self, visible):
+        self._labelVisible = visible
         if not visible and self.nameItem is None:
             return
         if visible and self.nameItem is None:
@@ -182,15 +192,21 @@ class _BaseNodeItem(QGraphicsItem):
             self._updateNameText()
 
     def setPortsLabelVisible(self, visible):
+        self._portsLabelVisible = visible
         for port in self.ports:
             port.setLabelVisible(visible)
 
-    def _updateUI(self):
+    def _updateUI(self, parameter=None):
         pass
 
     def _portConnectionChanged(self, port):
         pass
 
+    def _sceneConnectionChanged(self, port):
+        scene = self.scene()
+        if scene is not None:
+            scene._nodeConnectionChanged(port)
+
     def connectSource(self, node, inputName='input', outputName='output'):
         """
         input -> output
@@ -239,12 +255,14 @@ class _BaseNodeItem(QGraphicsItem):
         port.setParentItem(self)
         self.ports.append(port)
         port.portObj.connectChanged.connect(self._portConnectionChanged)
+        port.portObj.connectChanged.connect(self._sceneConnectionChanged)
 
     def removePort(self, port):
         self.ports.remove(port)
 
     def addTag(self, tagItem, position=0.0):
         tagItem.setParentItem(self)
+        self.tags.append(tagItem)
         margin_x = tagItem.w / 2.0 + TAG_MARGIN
         margin_y = tagItem.h / 2.0 + TAG_MARGIN
         if position <= 0.25:
@@ -297,19 +315,50 @@ class _BaseNodeItem(QGraphicsItem):
 
         return rect
 
-    def paint(self, painter, option, widget):
-        if self.isSelected():
-            penWidth = 2
+    def setBatched(self, batched):
+        """
+        when batched, the node is drawn by the scene in one picture with all other nodes,
+        the node and its children draw nothing but are still selectable
+        """
+        self.setFlag(QGraphicsItem.ItemHasNoContents, batched)
+        for item in self.ports + self.tags:
+            item.setVisible(not batched)
+        if self.disableItem is not None:
+            self.disableItem.setVisible(not batched and self.parameter('disable').getValue())
+        if batched:
+            self._hideLabelItems()
         else:
-            penWidth = 5
+            self.setLabelVisible(self._labelVisible)
+
+    def _hideLabelItems(self):
+        if self.nameItem is not None:
+            self.nameItem.setVisible(False)
+
+    def paint(self, painter, option, widget):
+        lod = self.scene().lod
         self.setHighlight(self.isSelected())
 
-        pen = QPen(self.borderColor)
-        pen.setWidth(penWidth)
-        painter.setPen(pen)
-        painter.setBrush(QBrush(self.fillColor))
+        if lod == LOD_FULL:
+            if self.isSelected():
+                penWidth = 2
+            else:
+                penWidth = 5
+
+            pen = QPen(self.borderColor)
+            pen.setWidth(penWidth)
+            painter.setPen(pen)
+            painter.setBrush(QBrush(self.fillColor))
+
+            painter.drawRoundedRect(self.x, self.y, self.w, self.h, self.roundness, self.roundness)
+        else:
+            painter.setPen(QPen(self.borderColor, 0))
+            painter.setBrush(QBrush(self.fillColor))
+            painter.drawRect(self.x, self.y, self.w, self.h)
 
-        painter.drawRoundedRect(self.x, self.y, self.w, self.h, self.roundness, self.roundness)
+    def itemChange(self, change, value):
+        if change == QGraphicsItem.ItemPositionHasChanged and self.scene() is not None:
+            self.scene()._nodePositionChanged(self)
+        return super(_BaseNodeItem, self).itemChange(change, value)
 
     def mouseMoveEvent(self, event):
         self.scene().updateSelectedNodesPipe()
@@ -350,6 +399,7 @@ class NodeItem(_BaseNodeItem):
         super(NodeItem, self)._initUI()
 
         self.labelItem = None
+        self._labelDirty = True
 
         self.inputPort = InputPort(name='input')
         self.outputPort = OutputPort(name='output')
@@ -360,28 +410,22 @@ class NodeItem(_BaseNodeItem):
 
         self.updatePortsPos()
 
-    def _updateLabelText(self):
-        if self.labelItem is None:
+    def _updateLabelText(self, parameter=None):
+        """
+        :param parameter: the changed parameter, the label is only rendered again if it's used by the label
+        """
+        if parameter is not None:
+            name = parameter.name()
+            if name != 'label' and not getLabelTemplate(self.parameter('label').getValue()).dependsOn(name):
+                return
+            self._labelDirty = True
+
+        # a hidden label is rendered when it's shown again by setLabelVisible
+        if self.labelItem is None or not self.labelItem.isVisibleTo(self) or not self._labelDirty:
             return
+        self._labelDirty = False
 
-        label = self.parameter('label').getValue()
-
-        expStrings = re.findall(EXPRESSION_VALUE_PATTERN, label)
-        for expString in expStrings:
-            paramName = ' '.join(expString.split(' ')[1:]).replace(']', '')
-            param = self.parameter(paramName)
-            if param is not None:
-                paramValue = param.getValue()
-                label = label.replace(expString, str(paramValue))
-
-        expStrings = re.findall(EXPRESSION_PYTHON_PATTERN, label)
-        for expString in expStrings:
-            pyString = ' '.join(expString.split(' ')[1:]).replace(']', '')
-            try:
-                result = eval(pyString)
-            except:
-                continue
-            label = label.replace(expString, str(result))
+        label = getLabelTemplate(self.parameter('label').getValue()).render(self)
 
         self.labelItem.setHtml(label)
 
@@ -389,6 +433,11 @@ class NodeItem(_BaseNodeItem):
         self.labelItem.setX((self.w - rect.width()) / 2.0)
         self.labelItem.setY(self.h / 2.0 + 0)
 
+    def _hideLabelItems(self):
+        super(NodeItem, self)._hideLabelItems()
+        if self.labelItem is not None:
+            self.labelItem.setVisible(False)
+
     def setLabelVisible(self, visible):
         super(NodeItem, self).setLabelVisible(visible)
         if not visible and self.labelItem is None:
@@ -400,9 +449,10 @@ class NodeItem(_BaseNodeItem):
         if visible:
             self._updateLabelText()
 
-    def _updateUI(self):
-        self._updateNameText()
-        self._updateLabelText()
+    def _updateUI(self, parameter=None):
+        if parameter is None or parameter.name() == 'name':
+            self._updateNameText()
+        self._updateLabelText(parameter)
 
     def getSources(self):
         ports = []
@@ -5,7 +5,7 @@
 
 from usdNodeGraph.module.sqt import *
 from ..pipe import Pipe
-from ..const import Const
+from ..const import Const, LOD_FULL
 
 PORT_SIZE = 10
 PORT_LABEL_COLOR = QColor(200, 200, 200)
@@ -131,6 +131,11 @@ class Port(QGraphicsEllipseItem):
         )
         return rect
 
+    def paint(self, painter, option, widget):
+        if self.scene().lod != LOD_FULL:
+            return
+        super(Port, self).paint(painter, option, widget)
+
     def setHighlight(self, toggle):
         if toggle:
             self.borderColor = self.borderHighlightColor
@@ -1,7 +1,16 @@
 from pxr import Sdr
+from usdNodeGraph.ui.parameter.parameter import ChoiceRegistry
+
+
+NODE_NAMES_CHOICES_KEY = 'sdr:nodeNames'
+
 
 class SdrRegistry(object):
+    """
+    the registry is queried once, the node names and the shader signatures are kept
+    """
     _reg = None
+    _shaderSignatures = {}
 
     @classmethod
     def getRegistry(cls):
@@ -9,12 +18,52 @@ class SdrRegistry(object):
             cls._reg = Sdr.Registry()
         return cls._reg
 
+    @classmethod
+    def clearCache(cls):
+        ChoiceRegistry.removeChoices(NODE_NAMES_CHOICES_KEY)
+        cls._shaderSignatures = {}
+
     @classmethod
     def getShaderNodeByName(cls, shaderName):
         return cls.getRegistry().GetShaderNodeByName(shaderName)
 
     @classmethod
     def getNodeNames(cls):
-        return cls.getRegistry().GetNodeNames()
+        """
+        :return: tuple, the choices shared by all callers
+        """
+        return ChoiceRegistry.getChoices(NODE_NAMES_CHOICES_KEY, lambda: cls.getRegistry().GetNodeNames())
+
+    @classmethod
+    def _getPropertySignature(cls, name, property):
+        return (
+            name,
+            str(property.GetTypeAsSdfType()[0]),
+            property.GetDefaultValue(),
+            property.IsConnectable(),
+        )
+
+    @classmethod
+    def getShaderSignature(cls, shaderName):
+        """
+        :return: (inputs, outputs), both sorted tuples of (name, typeName, defaultValue, connectable),
+                 None if the shader is not in the registry
+        """
+        if shaderName in cls._shaderSignatures:
+            return cls._shaderSignatures[shaderName]
 
+        signature = None
+        shaderNode = cls.getShaderNodeByName(shaderName)
+        if shaderNode is not None:
+            inputs = tuple(
+                cls._getPropertySignature(name, shaderNode.GetInput(name))
+                for name in sorted(shaderNode.GetInputNames())
+            )
+            outputs = tuple(
+                cls._getPropertySignature(name, shaderNode.GetOutput(name))
+                for name in sorted(shaderNode.GetOutputNames())
+            )
+            signature = (inputs, outputs)
 
+        cls._shaderSignatures[shaderName] = signature
+        return signature
@@ -37,8 +37,8 @@ class _UsdShadeNodeItem(UsdNodeItem):
         if self.nameItem is not None:
             self.nameItem.setY(10)
 
-    def _updateLabelText(self):
-        super(_UsdShadeNodeItem, self)._updateLabelText()
+    def _updateLabelText(self, parameter=None):
+        super(_UsdShadeNodeItem, self)._updateLabelText(parameter)
 
         if self.labelItem is not None:
             self.labelItem.setY(self.nameItem.pos().y() + self.nameItem.boundingRect().height())
@@ -306,7 +306,7 @@ class ShaderNode(_UsdShadeNode):
         super(ShaderNode, self)._initParameters()
         param = self.addParameter('info:id', 'choose', defaultValue='')
         param.setOrder(0)
-        param.addItems(SdrRegistry.getNodeNames())
+        param.setItems(SdrRegistry.getNodeNames())
 
     def _paramterValueChanged(self, parameter, value):
         super(ShaderNode, self)._paramterValueChanged(parameter, value)
@@ -324,10 +324,9 @@ class ShaderNode(_UsdShadeNode):
             if port is not None:
                 port.destroy()
 
-    def _addParameterFromProperty(self, paramName, property):
-        connectable = property.IsConnectable()
-        paramType = str(property.GetTypeAsSdfType()[0])
-        defaultValue = property.GetDefaultValue()
+    def _addParameterFromSignature(self, prefix, signature):
+        name, paramType, defaultValue, connectable = signature
+        paramName = '{}{}'.format(prefix, name)
 
         param = self.addParameter(
             paramName, paramType,
@@ -348,30 +347,23 @@ class ShaderNode(_UsdShadeNode):
 
             return param
 
-    def _addParametersFromShaderNode(self, shaderNode):
-        inputNames = shaderNode.GetInputNames()
-        inputNames.sort()
-        outputNames = shaderNode.GetOutputNames()
-        outputNames.sort()
-
-        for inputName in inputNames:
-            input = shaderNode.GetInput(inputName)
-            paramName = '{}{}'.format(INPUT_ATTRIBUTE_PREFIX, inputName)
-            self._addParameterFromProperty(paramName, input)
-        for outputName in outputNames:
-            output = shaderNode.GetOutput(outputName)
-            paramName = '{}{}'.format(OUTPUT_ATTRIBUTE_PREFIX, outputName)
-            self._addParameterFromProperty(paramName, output)
+    def _addParametersFromSignature(self, shaderSignature):
+        inputs, outputs = shaderSignature
+
+        for signature in inputs:
+            self._addParameterFromSignature(INPUT_ATTRIBUTE_PREFIX, signature)
+        for signature in outputs:
+            self._addParameterFromSignature(OUTPUT_ATTRIBUTE_PREFIX, signature)
 
         self.item.setLabelVisible(True)
         self.item.setPortsLabelVisible(True)
 
     def resetParameters(self):
         shaderName = self.parameter('info:id').getValue()
-        shaderNode = SdrRegistry.getShaderNodeByName(shaderName)
-        if shaderNode is not None:
+        shaderSignature = SdrRegistry.getShaderSignature(shaderName)
+        if shaderSignature is not None:
             self._clearParameters()
-            self._addParametersFromShaderNode(shaderNode)
+            self._addParametersFromSignature(shaderSignature)
         else:
             logger.warning('Can\'t get shader node information of {}'.format(shaderName))
 
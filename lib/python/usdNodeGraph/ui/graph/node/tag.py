@@ -6,6 +6,7 @@
 import os
 from usdNodeGraph.module.sqt import *
 from usdNodeGraph.utils.res import resource
+from ..const import LOD_FULL
 
 TAG_W = 20
 TAG_H = 20
@@ -34,3 +35,7 @@ class PixmapTag(QGraphicsPixmapItem):
         ))
         self.setScale(1.0 / self.scale_factor)
 
+    def paint(self, painter, option, widget):
+        if self.scene().lod != LOD_FULL:
+            return
+        super(PixmapTag, self).paint(painter, option, widget)
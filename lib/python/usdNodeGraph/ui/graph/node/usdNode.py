@@ -7,7 +7,7 @@ from usdNodeGraph.module.sqt import *
 from .node import Node, registerNode, setNodeDefault
 from .nodeItem import NodeItem
 from .tag import PixmapTag
-from usdNodeGraph.ui.parameter.parameter import Parameter, StringParameter
+from usdNodeGraph.ui.parameter.parameter import Parameter, StringParameter, ChoiceRegistry
 
 
 class UsdNodeItem(NodeItem):
@@ -123,7 +123,7 @@ class RootNode(UsdNode):
         self.addParameter('startTimeCode', 'float', defaultValue=None, label='Start', order=0)
         self.addParameter('endTimeCode', 'float', defaultValue=None, label='End', order=1)
 
-        self.parameter('upAxis').addItems(['X', 'Y', 'Z'])
+        self.parameter('upAxis').setItems(ChoiceRegistry.getChoices('upAxis', lambda: ['X', 'Y', 'Z']))
 
     def _execute(self, stage, prim):
         newPrim = stage.GetPrimAtPath('/')
@@ -141,7 +141,7 @@ class RootNode(UsdNode):
         if defaultPrim != '':
             rootLayer.defaultPrim = defaultPrim
         if upAxis != '':
-            UsdGeom.SetStageUpAxis(stage, getattr(UsdGeom.Tokens, upAxis.lower()))
+            stage.SetMetadata('upAxis', getattr(UsdGeom.Tokens, upAxis.lower()))
 
         return stage, newPrim
 
@@ -164,8 +164,7 @@ class PrimDefineNode(_PrimNode):
         newPrim.SetTypeName(typeName)
 
         if kindStr != '':
-            modelAPI = Usd.ModelAPI(newPrim)
-            modelAPI.SetKind(getattr(Kind.Tokens, kindStr))
+            newPrim.SetMetadata('kind', getattr(Kind.Tokens, kindStr))
 
         return stage, newPrim
 
@@ -188,8 +187,7 @@ class PrimOverrideNode(_PrimNode):
         newPrim.SetTypeName(typeName)
 
         if kindStr != '':
-            modelAPI = Usd.ModelAPI(newPrim)
-            modelAPI.SetKind(getattr(Kind.Tokens, kindStr))
+            newPrim.SetMetadata('kind', getattr(Kind.Tokens, kindStr))
 
         return stage, newPrim
 
@@ -274,8 +272,49 @@ class AttributeSetNode(UsdNode):
         super(AttributeSetNode, self).__init__(*args, **kwargs)
 
         if prim is not None:
-            for name, attribute in prim.attributes.items():
-                self._addAttributeParameter(attribute)
+            # the parameters are created from the attribute specs when they are first needed
+            self._attributePrim = prim
+            self._lazyAttributeNames = set(prim.attributes.keys())
+
+    def _materializeParameter(self, parameterName):
+        self._lazyAttributeNames.discard(parameterName)
+        attribute = self._attributePrim.attributes.get(parameterName)
+        if attribute is None:
+            return
+        # the parameter exists for the node already, nothing is changed or added
+        signalsBlocked = self.blockSignals(True)
+        self._addAttributeParameter(attribute)
+        self.blockSignals(signalsBlocked)
+
+    def materializeParameters(self):
+        """
+        create the parameters which are still read from the attribute specs,
+        needed before the layer of the specs is changed
+        """
+        for name in list(self._lazyAttributeNames):
+            self._materializeParameter(name)
+
+    def parameter(self, parameterName):
+        if parameterName in self._lazyAttributeNames:
+            self._materializeParameter(parameterName)
+        return super(AttributeSetNode, self).parameter(parameterName)
+
+    def hasParameter(self, name):
+        # the spec can be gone, so it's only known by creating the parameter
+        if name in self._lazyAttributeNames:
+            self._materializeParameter(name)
+        return super(AttributeSetNode, self).hasParameter(name)
+
+    def parameters(self):
+        self.materializeParameters()
+        return super(AttributeSetNode, self).parameters()
+
+    def removeParameter(self, parameterName):
+        if parameterName in self._lazyAttributeNames:
+            self._lazyAttributeNames.discard(parameterName)
+            self.parameterRemoved.emit(parameterName)
+            return
+        super(AttributeSetNode, self).removeParameter(parameterName)
 
     def _addAttributeParameter(self, attribute):
         attributeName = attribute.name
@@ -297,10 +336,11 @@ class AttributeSetNode(UsdNode):
 
     def _initParameters(self):
         super(AttributeSetNode, self)._initParameters()
-        pass
+        self._attributePrim = None
+        self._lazyAttributeNames = set()
 
     def _execute(self, stage, prim):
-        params = [param for param in self._parameters.values() if not param.isBuiltIn()]
+        params = [param for param in self.parameters() if not param.isBuiltIn()]
         for param in params:
             # print(param.name(), param.getValue(), param.hasKey())
             attrName = param.name()
@@ -413,7 +453,8 @@ class VariantSelectNode(_VariantNode):
             variantSet = stagePrim.GetVariantSet(variantSetName)
             # variantNameList = [v.name for v in self._prim.variantSets.get(variantSetName).variantList]
             variantNameList = variantSet.GetVariantNames()
-            self.parameter('variantSelected').addItems(variantNameList)
+            # the variant names change with the edits of the stage, so they are only interned
+            self.parameter('variantSelected').setItems(variantNameList)
 
     def _initParameters(self):
         super(VariantSelectNode, self)._initParameters()
@@ -522,6 +563,47 @@ class MaterialAssignNode(UsdNode):
         return stage, prim
 
 
+class CollapsedNodeItem(UsdNodeItem):
+    def mouseDoubleClickEvent(self, event):
+        self.scene().expandNode(self)
+
+
+class CollapsedNode(UsdNode):
+    """
+    placeholder of the children of a prim that is not populated yet,
+    the children prim specs are copied as they are when executing
+    """
+    nodeType = 'Collapsed'
+    nodeItem = CollapsedNodeItem
+    fillNormalColor = QColor(50, 60, 70, 150)
+    borderNormalColor = QColor(150, 150, 150, 150)
+
+    def __init__(self, prim=None, *args, **kwargs):
+        super(CollapsedNode, self).__init__(*args, **kwargs)
+
+        if prim is not None:
+            self.parameter('primPath').setValue(prim.path.pathString)
+            self.parameter('childCount').setValue(len(prim.nameChildren))
+
+    def _initParameters(self):
+        super(CollapsedNode, self)._initParameters()
+        self.addParameter('primPath', 'string', defaultValue='')
+        self.addParameter('childCount', 'int', defaultValue=0)
+
+    def _execute(self, stage, prim):
+        primPath = self.parameter('primPath').getValue()
+        if self._layer is None or primPath == '':
+            return stage, prim
+        primSpec = self._layer.GetPrimAtPath(primPath)
+        if primSpec is None:
+            return stage, prim
+
+        editTarget = stage.GetEditTarget()
+        for childName, childSpec in primSpec.nameChildren.items():
+            dstPath = editTarget.MapToSpecPath(prim.GetPath().AppendChild(childName))
+            Sdf.CopySpec(self._layer, childSpec.path, editTarget.GetLayer(), dstPath)
+
+        return stage, prim
 
 
 registerNode(LayerNode)
@@ -540,6 +622,7 @@ registerNode(VariantSwitchNode)
 
 registerNode(TransformNode)
 registerNode(MaterialAssignNode)
+registerNode(CollapsedNode)
 
 
 setNodeDefault(LayerNode.nodeType, 'label', '[python os.path.basename("[value layerPath]")]')
@@ -549,6 +632,8 @@ setNodeDefault(PrimOverrideNode.nodeType, 'label', '/[value primName]')
 setNodeDefault(ReferenceNode.nodeType, 'label', '[python os.path.basename("[value assetPath]")]')
 setNodeDefault(PayloadNode.nodeType, 'label', '[python os.path.basename("[value assetPath]")]')
 
+setNodeDefault(CollapsedNode.nodeType, 'label', '[value childCount] children...')
+
 setNodeDefault(MaterialAssignNode.nodeType, 'label', '[python os.path.basename("[value material]")]')
 
 setNodeDefault(VariantSetNode.nodeType, 'label', '{[value variantSetName]:[value variantList]}')
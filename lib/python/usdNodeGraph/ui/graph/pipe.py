@@ -4,11 +4,13 @@
 
 
 from usdNodeGraph.module.sqt import *
+from .const import LOD_FULL, LOD_SIMPLE_ZOOM
 import math
 
 
 PIPE_NORMAL_COLOR = QColor(130, 130, 130)
 PIPE_HIGHTLIGHT_COLOR = QColor(250, 250, 100)
+PIPE_TRANSLATE_TOLERANCE = 1e-6
 
 
 class Pipe(QGraphicsPathItem):
@@ -36,6 +38,19 @@ class Pipe(QGraphicsPathItem):
         self.curv2 = 0.0
         self.curv4 = 1.0
 
+        self._pathKey = None
+        self._centerPos = QPointF()
+        self._centerAngle = 0.0
+        self._boundingRect = QRectF()
+        self._penKey = None
+        self._pen = None
+
+        # the arrow is the widest thing drawn, at the smallest zoom it's still drawn
+        self._margin = self.pointAtLength / math.sqrt(LOD_SIMPLE_ZOOM)
+
+        self.setPen(QPen(self.lineColor, self.thickness))
+        self.setZValue(-1)
+
     def setLineColor(self, highlight=False, color=None):
         if color is not None:
             self.lineColor = color
@@ -53,6 +68,14 @@ class Pipe(QGraphicsPathItem):
         if self.target:
             targetPos = self.target.mapToScene(self.target.boundingRect().center())
 
+        pathKey = (sourcePos.x(), sourcePos.y(), targetPos.x(), targetPos.y(), orientation)
+        if pathKey == self._pathKey:
+            return
+        if self._isTranslated(pathKey):
+            self._translatePath(pathKey)
+            return
+        self._pathKey = pathKey
+
         path = QPainterPath()
         path.moveTo(sourcePos)
 
@@ -90,8 +113,40 @@ class Pipe(QGraphicsPathItem):
             sourcePos.y() + dy * self.curv4)
 
         path.cubicTo(ctrl1, ctrl2, targetPos)
+
+        self._centerPos = path.pointAtPercent(0.5)
+        self._centerAngle = path.angleAtPercent(0.5)
+        # boundingRect returns the cached rect, so qt has to see the old one before it's replaced
+        self.prepareGeometryChange()
+        self._boundingRect = path.boundingRect().adjusted(-self._margin, -self._margin, self._margin, self._margin)
         self.setPath(path)
 
+    def _isTranslated(self, pathKey):
+        if self._pathKey is None or pathKey[4] != self._pathKey[4]:
+            return False
+        sx, sy, tx, ty = [pathKey[i] - self._pathKey[i] for i in range(4)]
+        return abs(sx - tx) < PIPE_TRANSLATE_TOLERANCE and abs(sy - ty) < PIPE_TRANSLATE_TOLERANCE
+
+    def _translatePath(self, pathKey):
+        # both ends moved together, the curve keeps its shape
+        offset = QPointF(pathKey[0] - self._pathKey[0], pathKey[1] - self._pathKey[1])
+        self._pathKey = pathKey
+        self._centerPos = self._centerPos + offset
+        self.prepareGeometryChange()
+        self._boundingRect = self._boundingRect.translated(offset)
+        self.setPath(self.path().translated(offset))
+
+    def boundingRect(self):
+        return self._boundingRect
+
+    def _getPen(self, zoom):
+        color = PIPE_HIGHTLIGHT_COLOR if self.isSelected() else self.lineColor
+        penKey = (color.rgba(), zoom)
+        if penKey != self._penKey:
+            self._penKey = penKey
+            self._pen = QPen(color, self.thickness / math.sqrt(zoom))
+        return self._pen
+
     def breakConnection(self):
         if self.source is not None:
             self.source.removePipe(self)
@@ -99,24 +154,22 @@ class Pipe(QGraphicsPathItem):
             self.target.removePipe(self)
 
     def paint(self, painter, option, widget):
-        zoom = self.scene().views()[0].currentZoom
-        thickness = self.thickness / math.sqrt(zoom)
-        pointAtLength = self.pointAtLength / math.sqrt(zoom)
-
-        if self.isSelected():
-            pen = QPen(PIPE_HIGHTLIGHT_COLOR, thickness)
-        else:
-            pen = QPen(self.lineColor, thickness)
-        self.setPen(pen)
-        self.setZValue(-1)
-        super(Pipe, self).paint(painter, option, widget)
+        if self.scene().lod != LOD_FULL:
+            painter.setPen(QPen(PIPE_HIGHTLIGHT_COLOR if self.isSelected() else self.lineColor, 0))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawPath(self.path())
+            return
 
-        center_pos = self.path().pointAtPercent(0.5)
-        center_angle = self.path().angleAtPercent(0.5)
+        zoom = option.levelOfDetailFromTransform(painter.worldTransform())
+        pointAtLength = self.pointAtLength / math.sqrt(zoom)
 
+        pen = self._getPen(zoom)
         painter.setPen(pen)
-        painter.translate(center_pos)
-        painter.rotate(180 - (center_angle + 30))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPath(self.path())
+
+        painter.translate(self._centerPos)
+        painter.rotate(180 - (self._centerAngle + 30))
         painter.drawLine(QPointF(0, 0), QPointF(pointAtLength, 0))
         painter.rotate(60)
         painter.drawLine(QPointF(0, 0), QPointF(pointAtLength, 0))
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# __author__ = 'XingHuan'
+
+
+import math
+
+
+GRID_CELL_SIZE = 1000
+
+
+class GridIndex(object):
+    """
+    a uniform grid of item positions, so the items in a rect can be found
+    without visiting every item of the scene
+    """
+
+    def __init__(self, cellSize=GRID_CELL_SIZE):
+        self._cellSize = float(cellSize)
+        self._cells = {}
+        self._itemCells = {}
+
+    def _getCell(self, x, y):
+        return int(math.floor(x / self._cellSize)), int(math.floor(y / self._cellSize))
+
+    def clear(self):
+        self._cells = {}
+        self._itemCells = {}
+
+    def contains(self, item):
+        return item in self._itemCells
+
+    def insert(self, item, pos):
+        cell = self._getCell(pos.x(), pos.y())
+        self._itemCells[item] = cell
+        self._cells.setdefault(cell, set()).add(item)
+
+    def remove(self, item):
+        cell = self._itemCells.pop(item, None)
+        if cell is not None:
+            cellItems = self._cells[cell]
+            cellItems.discard(item)
+            if len(cellItems) == 0:
+                self._cells.pop(cell)
+
+    def move(self, item, pos):
+        cell = self._getCell(pos.x(), pos.y())
+        if self._itemCells.get(item) != cell:
+            self.remove(item)
+            self.insert(item, pos)
+
+    def query(self, rect):
+        """
+        :param rect: QRectF
+        :return: items whose pos is in rect
+        """
+        left, top = self._getCell(rect.left(), rect.top())
+        right, bottom = self._getCell(rect.right(), rect.bottom())
+
+        if (right - left + 1) * (bottom - top + 1) > len(self._cells):
+            cells = [cell for cell in self._cells.keys()
+                     if left <= cell[0] <= right and top <= cell[1] <= bottom]
+        else:
+            cells = [(i, j) for i in range(left, right + 1) for j in range(top, bottom + 1)]
+
+        items = []
+        for cell in cells:
+            cellItems = self._cells.get(cell)
+            if cellItems is None:
+                continue
+            for item in cellItems:
+                if rect.contains(item.pos()):
+                    items.append(item)
+        return items
@@ -9,26 +9,38 @@ import time
 import logging
 from pxr import Usd, Sdf, Ar
 from usdNodeGraph.module.sqt import *
-from usdNodeGraph.utils.const import INPUT_ATTRIBUTE_PREFIX, OUTPUT_ATTRIBUTE_PREFIX, VIEWPORT_FULL_UPDATE
+from usdNodeGraph.utils.const import (
+    INPUT_ATTRIBUTE_PREFIX, OUTPUT_ATTRIBUTE_PREFIX, VIEWPORT_FULL_UPDATE, VIEWPORT_OPENGL, LAZY_POPULATE,
+    EXECUTE_BACKEND, APPLY_MODE
+)
+from usdNodeGraph.utils.sdfStage import SdfStage, executeBlock, editContext
+from usdNodeGraph.utils.layerPatch import patchLayer
 from .node import (Node, NodeItem, LayerNode, ReferenceNode, PayloadNode)
 from .pipe import Pipe
-from .node.port import Port
+from .spatialIndex import GridIndex
+from .layerTraversal import LayerTraversal, LayerTraversalThread, UP_NODE_KEY
+from .node.port import InputPort
+from .const import Const, LOD_FULL, LOD_SIMPLE, LOD_BATCH, LOD_SIMPLE_ZOOM, LOD_BATCH_ZOOM
 
 
 logger = logging.getLogger('usdNodeGraph.view')
 
 
 NODE_NAME_PATTERN = re.compile('(?P<suffix>[^\d]*)(?P<index>\d+)')
-VARIANT_PRIM_PATH_PATTERN = re.compile('.*{(?P<variantSet>.+)=(?P<variant>.+)}$')
 
 VIEW_FILL_COLOR = QColor(38, 38, 38)
 VIEW_LINE_COLOR = QColor(55, 55, 55)
 VIEW_CENTER_LINE_COLOR = QColor(80, 80, 60, 50)
+VIEW_PIPE_BATCH_COLOR = QColor(130, 130, 130)
 VIEW_GRID_WIDTH = 200
 VIEW_GRID_HEIGHT = 100
 
 VIEW_ZOOM_STEP = 1.1
 
+LOAD_POLL_INTERVAL = 50
+LOAD_TIME_SLICE = 0.03
+LOAD_CHUNK_SIZE = 50
+
 
 class FloatLineEdit(QFrame):
     editFinished = Signal(str)
@@ -80,11 +92,18 @@ class GraphicsView(QGraphicsView):
         self.keyZooming = False
         self.clickedPos = QPointF(0, 0)
 
+        self._labelVisibleNodes = set()
+        self._labelVisibleState = None
+        self._gridTile = None
+        self._gridTileKey = None
+
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.setDragMode(QGraphicsView.RubberBandDrag)
         self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
-        if VIEWPORT_FULL_UPDATE == '0':
+        if VIEWPORT_OPENGL == '1':
+            self._setOpenGLViewport()
+        elif VIEWPORT_FULL_UPDATE == '0':
             self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
         else:
             self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
@@ -95,6 +114,15 @@ class GraphicsView(QGraphicsView):
 
         self._createNewFloatEdit.editFinished.connect(self._floatEditFinished)
 
+    def _setOpenGLViewport(self):
+        glFormat = QtOpenGL.QGLFormat()
+        glFormat.setSampleBuffers(True)
+        self.setViewport(QtOpenGL.QGLWidget(glFormat))
+        # a gl viewport is redrawn entirely anyway, partial updates only cost the region bookkeeping
+        self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        self.setCacheMode(QGraphicsView.CacheNone)
+        self.setOptimizationFlags(QGraphicsView.DontAdjustForAntialiasing)
+
     def _zoom(self, zoom):
         self.scale(zoom, zoom)
         self.currentZoom = self.transform().m11()
@@ -114,6 +142,7 @@ class GraphicsView(QGraphicsView):
         ))
 
         self._setAntialiasing()
+        self._setLod()
 
         if setLabel:
             self._setLabelVisible()
@@ -122,6 +151,15 @@ class GraphicsView(QGraphicsView):
         antialiasing = True if self.currentZoom >= 0.1 else False
         self.setRenderHint(QPainter.Antialiasing, antialiasing)
 
+    def _setLod(self):
+        if self.currentZoom < LOD_BATCH_ZOOM:
+            lod = LOD_BATCH
+        elif self.currentZoom < LOD_SIMPLE_ZOOM:
+            lod = LOD_SIMPLE
+        else:
+            lod = LOD_FULL
+        self.scene().setLod(lod)
+
     def _setLabelVisible(self):
         showPortLabel = True if self.currentZoom >= 1 else False
         showNodeLabel = True if self.currentZoom >= 0.5 else False
@@ -130,9 +168,20 @@ class GraphicsView(QGraphicsView):
         point2 = self.mapToScene(QPoint(self.viewport().width(), self.viewport().height()))
         rect = QRectF(point1, point2)
 
-        for node in self.scene().allNodes():
-            if rect.contains(node.pos()):
+        visibleNodes = set(self.scene().getNodesInRect(rect))
+        state = (showNodeLabel, showPortLabel)
+        if state != self._labelVisibleState:
+            nodes = visibleNodes
+        else:
+            # only the nodes which enter the viewport may be changed
+            nodes = visibleNodes - self._labelVisibleNodes
+        self._labelVisibleNodes = visibleNodes
+        self._labelVisibleState = state
+
+        for node in nodes:
+            if node.isLabelVisible() != showNodeLabel:
                 node.setLabelVisible(showNodeLabel)
+            if node.isPortsLabelVisible() != showPortLabel:
                 node.setPortsLabelVisible(showPortLabel)
 
     def focusNextPrevChild(self, bool):
@@ -204,7 +253,6 @@ class GraphicsView(QGraphicsView):
         if event.button() == Qt.MiddleButton:
             for item in selectedItems:
                 item.setSelected(True)
-        self._highlightConnection()
 
     def mouseMoveEvent(self, event):
         if self.keyZooming:
@@ -238,7 +286,6 @@ class GraphicsView(QGraphicsView):
 
         super(GraphicsView, self).mouseReleaseEvent(event)
 
-        self._highlightConnection()
         self.clickedPos = event.pos()
         self._resizeScene()
 
@@ -247,47 +294,51 @@ class GraphicsView(QGraphicsView):
         zoom = VIEW_ZOOM_STEP if positive else 1.0 / VIEW_ZOOM_STEP
         self._zoom(zoom)
 
-    def drawBackground(self, painter, rect):
-        painter.setBrush(QBrush(VIEW_FILL_COLOR))
-        painter.setPen(QPen(VIEW_LINE_COLOR))
+    def _getGridTile(self, cellWidth, cellHeight):
+        """
+        one grid cell rendered at the size it covers on the viewport,
+        so the 1px lines are drawn 1:1 and don't disappear at any zoom,
+        it's rendered again only when the zoom changes
+        """
+        width = max(int(round(cellWidth * self.currentZoom)), 1)
+        height = max(int(round(cellHeight * self.currentZoom)), 1)
+        tileKey = (width, height)
+        if self._gridTileKey != tileKey:
+            tile = QPixmap(width, height)
+            tile.fill(VIEW_FILL_COLOR)
+            painter = QPainter(tile)
+            painter.setPen(QPen(VIEW_LINE_COLOR, 0))
+            painter.drawLine(0, 0, width, 0)
+            painter.drawLine(0, 0, 0, height)
+            painter.end()
+            self._gridTile = tile
+            self._gridTileKey = tileKey
+        return self._gridTile
 
-        painter.drawRect(rect)
-        lines = []
+    def drawBackground(self, painter, rect):
         scale = max(int(1 / self.currentZoom / 2), 1)
-        line_w = VIEW_GRID_WIDTH * scale
-        line_h = VIEW_GRID_HEIGHT * scale
-
-        point1 = self.mapToScene(QPoint(0, 0))
-        point2 = self.mapToScene(QPoint(self.viewport().width(), self.viewport().height()))
-
-        # for i in range(int(point1.y() / line_h), int(self.scene().height() / line_h)):
-        for i in range(int(point1.y() / line_h), int(point2.y() / line_h) + 1):
-            lines.append(QLineF(
-                QPoint(rect.x(), i * line_h),
-                QPoint(rect.x() + rect.width(), i * line_h)))
-        # for i in range(int(self.scene().sceneRect().x()), int(self.scene().width() / line_w)):
-        for i in range(int(point1.x() / line_w), int(point2.x() / line_w) + 1):
-            lines.append(QLineF(
-                QPoint(i * line_w, rect.y()),
-                QPoint(i * line_w, rect.y() + rect.height())))
-        painter.drawLines(lines)
+        cellWidth = VIEW_GRID_WIDTH * scale
+        cellHeight = VIEW_GRID_HEIGHT * scale
+        tile = self._getGridTile(cellWidth, cellHeight)
+
+        # draw in tile space, where one tile pixel is one viewport pixel
+        # (only off by the rounding of the tile size, so the lines stay on the scene grid)
+        tileScaleX = float(cellWidth) / tile.width()
+        tileScaleY = float(cellHeight) / tile.height()
+        painter.save()
+        painter.scale(tileScaleX, tileScaleY)
+        tileRect = QRectF(rect.x() / tileScaleX, rect.y() / tileScaleY,
+                          rect.width() / tileScaleX, rect.height() / tileScaleY)
+        offset = QPointF(tileRect.x() % tile.width(), tileRect.y() % tile.height())
+        painter.drawTiledPixmap(tileRect, tile, offset)
+        painter.restore()
 
         painter.setPen(QPen(VIEW_CENTER_LINE_COLOR))
         painter.drawLine(QLineF(QPoint(rect.x(), 0), QPoint(rect.x() + rect.width(), 0)))
         painter.drawLine(QLineF(QPoint(0, rect.y()), QPoint(0, rect.y() + rect.height())))
 
-    def _highlightConnection(self):
-        for item in self.scene().items():
-            if isinstance(item, Port):
-                for pipe in item.pipes:
-                    pipe.setLineColor(highlight=False)
-            # if isinstance(item, NodeItem):
-            #     item.setHighlight(False)
-        for item in self.scene().selectedItems():
-            if isinstance(item, NodeItem):
-                for port in item.ports:
-                    for pipe in port.pipes:
-                        pipe.setLineColor(highlight=True)
+        if self.scene().lod == LOD_BATCH:
+            painter.drawPicture(0, 0, self.scene().getBatchPicture())
 
     def showFloatEdit(self):
         self._createNewFloatEdit.move(self.clickedPos)
@@ -320,6 +371,8 @@ class GraphicsSceneWidget(QWidget):
         # self.showWidgetSignal.connect(self.show_entity_widget, Qt.QueuedConnection)
         self.scene.enterFileRequired.connect(self._enterFileRequired)
         self.scene.enterLayerRequired.connect(self._enterLayerRequired)
+        self.scene.loadProgressChanged.connect(self._loadProgressChanged)
+        self.scene.loadFinished.connect(self._loadFinished)
 
     def _initUI(self):
 
@@ -328,8 +381,20 @@ class GraphicsSceneWidget(QWidget):
         self.view.setScene(self.scene)
         self.setGeometry(100, 100, 800, 600)
 
+        self.loadProgressBar = QProgressBar()
+        self.loadCancelButton = QPushButton('Cancel')
+        self.loadCancelButton.clicked.connect(self.scene.cancelLoad)
+
+        loadLayout = QHBoxLayout()
+        loadLayout.addWidget(self.loadProgressBar)
+        loadLayout.addWidget(self.loadCancelButton)
+        self.loadWidget = QWidget()
+        self.loadWidget.setLayout(loadLayout)
+        self.loadWidget.setVisible(False)
+
         layout = QVBoxLayout()
         layout.addWidget(self.view)
+        layout.addWidget(self.loadWidget)
         self.setLayout(layout)
 
         self.scene.setSceneRect(QRectF(
@@ -345,6 +410,18 @@ class GraphicsSceneWidget(QWidget):
         absLayerPath = resolver.AnchorRelativePath(self.layer.realPath, path)
         return absLayerPath
 
+    def _loadProgressChanged(self, value, maximum):
+        self.loadWidget.setVisible(True)
+        self.loadProgressBar.setMaximum(maximum)
+        self.loadProgressBar.setValue(value)
+        if maximum == 0:
+            self.loadProgressBar.setFormat('reading layer... {} nodes'.format(value))
+        else:
+            self.loadProgressBar.setFormat('creating nodes... %v / %m')
+
+    def _loadFinished(self):
+        self.loadWidget.setVisible(False)
+
     def _enterFileRequired(self, usdFile):
         # for Reference and Payload
         absLayerPath = self._getAbsPath(usdFile)
@@ -374,6 +451,8 @@ class GraphicsScene(QGraphicsScene):
     enterFileRequired = Signal(str)
     enterLayerRequired = Signal(str)
     nodeParameterChanged = Signal(object)
+    loadProgressChanged = Signal(int, int)
+    loadFinished = Signal()
 
     def __init__(self, view=None, **kwargs):
         super(GraphicsScene, self).__init__(**kwargs)
@@ -384,12 +463,39 @@ class GraphicsScene(QGraphicsScene):
         self.layer = None
 
         self._allNodes = {}
+        self._nodesByName = {}
+        self._nodesByType = {}
         self._nodesSuffix = {}
         self._primNodes = {}
+        self._nodesGrid = GridIndex()
+        self.rootNode = None
+
+        self._resetExecuteState()
+
+        self._highlightedPipes = set()
+
+        self._loadThread = None
+        self._loadTraversal = None
+        self._loadNodes = []
+        self._loadStartTime = 0
+        self._loadCancelled = False
+        self._loadTimer = QTimer(self)
+        self._loadTimer.timeout.connect(self._loadStep)
+
+        self._dirtyPipes = set()
+        self._pipeUpdateTimer = QTimer(self)
+        self._pipeUpdateTimer.setSingleShot(True)
+        self._pipeUpdateTimer.setInterval(0)
+        self._pipeUpdateTimer.timeout.connect(self._updateDirtyPipes)
+
+        self.lod = LOD_FULL
+        self._batchPicture = None
 
         self.setSceneRect(QRectF(-25000 / 2, -25000 / 2, 25000, 25000))
 
         self.nodeParameterChanged.connect(self._nodeParameterChanged)
+        self.selectionChanged.connect(self._highlightConnection)
+        self.selectionChanged.connect(self._invalidateBatchPicture)
 
     def _nodeParameterChanged(self, parameter):
         if parameter.name() == 'name':
@@ -408,143 +514,57 @@ class GraphicsScene(QGraphicsScene):
             node.setY(upNode.pos().y() + upNode.h + 100)
             node.connectToNode(upNode)
 
-    def _getPrim(self, prim, upNode=None, index=0):
-        skipAttribute = False
-
-        primPath = prim.path.pathString
-        match = re.match(VARIANT_PRIM_PATH_PATTERN, primPath)
-        if match:
-            variantSwitchNode = self.createNode(
-                'VariantSwitch',
-                variantSetName=match.group('variantSet'),
-                variantSelected=match.group('variant')
-            )
-            self._addChildNode(variantSwitchNode, upNode, index=index)
-            upNode = variantSwitchNode
-        else:
-            # prim define
-            specifier = prim.specifier
-            if specifier == Sdf.SpecifierDef:
-                typeName = prim.typeName
-                if typeName in ['Material', 'Shader']:
-                    primNode = self.createNode(typeName, name=prim.name, prim=prim)
-                    skipAttribute = True
-                else:
-                    primNode = self.createNode('PrimDefine', prim=prim)
-            elif specifier == Sdf.SpecifierOver:
-                primNode = self.createNode('PrimOverride', prim=prim)
-            else:
-                return upNode
-
-            self._addChildNode(primNode, upNode, index=index)
-            self._primNodes.update({primPath: primNode})
-            upNode = primNode
-
-        # reference
-        referenceList = prim.referenceList.GetAddedOrExplicitItems()
-        for reference in referenceList:
-            referenceNode = self.createNode('Reference', reference=reference)
-            self._addChildNode(referenceNode, upNode)
-
-            upNode = referenceNode
-
-        # payload
-        payloadList = prim.payloadList.GetAddedOrExplicitItems()
-        for payload in payloadList:
-            payloadNode = self.createNode('Payload', payload=payload)
-            self._addChildNode(payloadNode, upNode)
-
-            upNode = payloadNode
-
-        # attribute
-        if not skipAttribute:
-            upNode = self._getPrimAttributes(prim, upNode)
-
-        # relationship
-        upNode = self._getPrimRelationships(prim, upNode)
-
-        # variant
-        selectedVariantDict = {}
-        variantSetNameList = prim.variantSetNameList
-        variantSetNameItems = variantSetNameList.GetAddedOrExplicitItems()
-        variantSelections = prim.variantSelections
-        if len(variantSetNameItems) > 0:
-            variantSets = prim.variantSets
-            for variantSetName, variantSetSpec in variantSets.items():
-                variantSetNode = self.createNode('VariantSet', variantSet=variantSetSpec)
-                self._addChildNode(variantSetNode, upNode)
-
-                variantSelected = variantSelections.get(variantSetName)
-                variantSelectNode = self.createNode(
-                    'VariantSelect',
-                    variantSetName=variantSetName,
-                    variantSelected=variantSelected,
-                    prim=prim
-                )
-                self._addChildNode(variantSelectNode, variantSetNode)
-                selectedVariantDict.update({variantSetName: variantSelected})
-
-                variantList = variantSetSpec.variantList
-                for i, variantSpec in enumerate(variantList):
-                    variantPrim = variantSpec.primSpec
-                    self._getIntoPrim(variantPrim, upNode=variantSelectNode, index=i)
-
-        for variantSetName, variantSelected in variantSelections.items():
-            if not variantSetName in selectedVariantDict:
-                variantSelectNode = self.createNode(
-                    'VariantSelect',
-                    variantSetName=variantSetName,
-                    variantSelected=variantSelected,
-                    prim=prim
-                )
-                self._addChildNode(variantSelectNode, upNode)
-
-        return upNode
-
-    def _getPrimAttributes(self, prim, upNode, index=0):
-        if len(prim.attributes.keys()) == 0:
-            return upNode
-
-        attributeSetNode = self.createNode('AttributeSet', prim=prim)
-        self._addChildNode(attributeSetNode, upNode, index=index)
-
-        return attributeSetNode
-
-    def _getPrimRelationships(self, prim, upNode, index=0):
-        if len(prim.relationships.keys()) == 0:
-            return upNode
-
-        if 'material:binding' in prim.relationships.keys():
-            relationship = prim.relationships.get('material:binding')
-            material = relationship.targetPathList.GetAddedOrExplicitItems()[0].pathString
-            materialAssignNode = self.createNode('MaterialAssign', material=material)
-            self._addChildNode(materialAssignNode, upNode, index=index)
-            upNode = materialAssignNode
-
-            if len(prim.relationships.keys()) == 1:  # only material:binding
-                return upNode
-
-        relationshipSetNode = self.createNode('RelationshipSet', prim=prim)
-        self._addChildNode(relationshipSetNode, upNode, index=index)
-        upNode = relationshipSetNode
-
-        return upNode
-
-    def _getIntoPrim(self, prim, upNode, index=0):
-        childrenCount = 0
+    def _createTraversal(self):
+        return LayerTraversal(lazyPopulate=LAZY_POPULATE != '0')
+
+    def _buildNodes(self, traversal, upNode, builtNodes=None, count=None):
+        """
+        create the nodes described by a LayerTraversal
+        :param builtNodes: the nodes already created for the description, new nodes are appended
+        :param count: the max number of nodes to create
+        :return: builtNodes
+        """
+        if builtNodes is None:
+            builtNodes = []
+        start = len(builtNodes)
+        end = None if count is None else start + count
+        for nodeClass, kwargs, upKey, index, primPath in traversal.nodes[start:end]:
+            node = self.createNode(nodeClass, **kwargs)
+            if upKey == UP_NODE_KEY:
+                self._addChildNode(node, upNode, index=index)
+            elif upKey is not None:
+                self._addChildNode(node, builtNodes[upKey], index=index)
+            if primPath is not None:
+                self._primNodes.update({primPath: node})
+            builtNodes.append(node)
+        return builtNodes
+
+    def expandNode(self, node):
+        """
+        populate the children of a Collapsed node and remove it
+        :param node:
+        :return: new top nodes
+        """
+        if node.Class() != 'Collapsed':
+            return []
+
+        primPath = node.parameter('primPath').getValue()
+        prim = self.layer.GetPrimAtPath(primPath)
+        sourceNodes = node.getSources()
+        upNode = sourceNodes[0] if len(sourceNodes) > 0 else self.rootNode
+        self._removeNode(node)
+        if prim is None:
+            return []
+
+        oldNodes = set(self.allNodes())
+
+        traversal = self._createTraversal()
+        traversal.traverseChildren(prim, depth=1)
+        self._buildNodes(traversal, upNode)
 
-        primPath = prim.path
-        node = upNode
-        if primPath != '/':
-            node = self._getPrim(prim, upNode, index)
-        for childName, child in prim.nameChildren.items():
-            currentChildCount = self._getIntoPrim(child, node, childrenCount)
-            if currentChildCount > 1:
-                childrenCount += currentChildCount
-            else:
-                childrenCount += 1
+        self._connectShadeNodes()
 
-        return childrenCount
+        return [n for n in upNode.getDestinations() if n not in oldNodes]
 
     def _connectShadeNodeInputs(self, node):
         if not node.Class() in ['Shader', 'Material']:
@@ -577,13 +597,22 @@ class GraphicsScene(QGraphicsScene):
             node.updatePipe()
 
     def _afterNodeNameChanged(self, node):
-        self._allNodes[node] = node.name()
-
-    def _getUniqueName(self, name):
-        # nodes = self.allNodes()
-        # names = [n.name() for n in nodes]
-        names = self._allNodes.values()
-
+        self._removeNodeName(node, self._allNodes.get(node))
+
+        name = node.name()
+        self._allNodes[node] = name
+        # a node can be renamed to an existing name in the parameter panel, so there can be more nodes of a name
+        self._nodesByName.setdefault(name, []).append(node)
+        self._addNameIndex(*self._splitName(name))
+
+    def _removeNodeName(self, node, name):
+        nodes = self._nodesByName.get(name, [])
+        if node in nodes:
+            nodes.remove(node)
+        if len(nodes) == 0:
+            self._nodesByName.pop(name, None)
+
+    def _splitName(self, name):
         match = re.match(NODE_NAME_PATTERN, name)
         if match:
             suffix = match.group('suffix')
@@ -591,20 +620,23 @@ class GraphicsScene(QGraphicsScene):
         else:
             suffix = name
             index = 0
+        return suffix, index
+
+    def _addNameIndex(self, suffix, index):
+        # only the max index of each suffix is needed to find a unique name
+        if index > self._nodesSuffix.get(suffix, index - 1):
+            self._nodesSuffix[suffix] = index
 
-        if name not in names:
+    def _getUniqueName(self, name):
+        suffix, index = self._splitName(name)
+
+        if name not in self._nodesByName:
             return name, suffix, index
 
         if suffix in self._nodesSuffix:
-            indexs = self._nodesSuffix.get(suffix)
-            indexs.sort(reverse=True)
-        else:
-            indexs = []
+            index = self._nodesSuffix.get(suffix)
 
-        if len(indexs) > 0:
-            index = indexs[0]
-
-        while name in names:
+        while name in self._nodesByName:
             index += 1
             name = '{}{}'.format(suffix, index)
 
@@ -614,11 +646,22 @@ class GraphicsScene(QGraphicsScene):
         nodes.sort(lambda n1,n2: cmp(n1.pos().y(),n2.pos().y()))
         for node in nodes:
             stage, _ = node.execute(stage, None)
+        self._executedLayerNodes = nodes
 
         return stage
 
     def _executeNode(self, node, stage, prim):
+        # remember where the node was executed, so it can be re-executed alone when it gets dirty
+        self._executeContexts[node] = (prim, stage.GetEditTarget())
+        inputPrim = prim
+
         stage, prim = node.execute(stage, prim)
+        if node.hasParameter('primName'):
+            if prim is not None and (inputPrim is None or prim.GetPath() != inputPrim.GetPath()):
+                self._executedPrimPaths[node] = prim.GetPath()
+            else:
+                self._executedPrimPaths.pop(node, None)
+
         if node.Class() == 'VariantSwitch':
             variantSet = node.nodeObject.getVariantSet(prim)
             with variantSet.GetVariantEditContext():
@@ -630,15 +673,166 @@ class GraphicsScene(QGraphicsScene):
 
         return stage
 
+    def _createExecuteStage(self):
+        if EXECUTE_BACKEND == 'sdf':
+            return SdfStage.CreateInMemory()
+        return Usd.Stage.CreateInMemory()
+
     def _executeAllToStage(self):
-        stage = Usd.Stage.CreateInMemory()
+        self._resetExecuteState()
+
+        t = time.time()
+
+        stage = self._createExecuteStage()
         prim = None
 
-        layerNodes = self.getNodes(type='Layer')
-        stage = self._executeLayerNodes(stage, layerNodes)
+        with executeBlock(stage):
+            layerNodes = self.getNodes(type='Layer')
+            stage = self._executeLayerNodes(stage, layerNodes)
 
-        node = self.rootNode
-        stage = self._executeNode(node, stage, prim)
+            node = self.rootNode
+            stage = self._executeNode(node, stage, prim)
+
+        self._executedStage = stage
+
+        logger.debug('execute time ({}): {}'.format(EXECUTE_BACKEND, time.time() - t))
+
+        return stage
+
+    def _resetExecuteState(self):
+        self._executedStage = None
+        self._executedLayerNodes = []
+        self._executeContexts = {}
+        self._executedPrimPaths = {}
+        self._dirtyNodes = set()
+        self._rootDirty = False
+
+    def _nodeParameterValueChanged(self, parameter, value):
+        if parameter.name() in ['label', 'x', 'y']:
+            return
+        node = parameter.node().item
+        if node is self.rootNode:
+            self._rootDirty = True
+        else:
+            self._dirtyNodes.add(node)
+
+    def _nodeConnectionChanged(self, port):
+        # a pipe can be connected to a node which is selected already
+        self._highlightConnection()
+
+        node = port.node()
+        if node is None:
+            return
+        if isinstance(port, InputPort) and port in getattr(node, 'inputPorts', []):
+            # the node is moved under another prim, its old specs are removed by the old source,
+            # and the new source re-executes it
+            for sourceNode in node.getSources():
+                self._dirtyNodes.add(sourceNode)
+        else:
+            self._dirtyNodes.add(node)
+
+    def _getUpNode(self, node):
+        sourceNodes = node.getSources()
+        if len(sourceNodes) == 1:
+            return sourceNodes[0]
+
+    def _getExecuteOwner(self, node):
+        """
+        the nearest executed prim node that contains all the specs authored by node
+        :param node:
+        :return: (isConnected, ownerNode), ownerNode is None when the whole stage need to execute
+        """
+        owner = None
+        while node is not None:
+            if node is self.rootNode:
+                return True, owner
+            if len(node.getSources()) > 1:
+                # ambiguous, the node is executed under each of its sources, only a full execute covers them all
+                return True, None
+            if (owner is None
+                    and node in self._executeContexts
+                    and node in self._executedPrimPaths):
+                owner = node
+            node = self._getUpNode(node)
+        return False, None
+
+    def _getSubtreeNodes(self, node):
+        nodes = set()
+        pendingNodes = [node]
+        while len(pendingNodes) > 0:
+            node = pendingNodes.pop()
+            if node in nodes:
+                continue
+            nodes.add(node)
+            pendingNodes.extend(node.getDestinations())
+        return nodes
+
+    def _hasOutsideSpecs(self, owner):
+        """
+        whether nodes out of the subtree of owner authored specs at or under the prim path of owner,
+        RemovePrim of the owner path would remove them too
+        """
+        ownerPath = self._executedPrimPaths[owner]
+        subtreeNodes = self._getSubtreeNodes(owner)
+        for node, primPath in self._executedPrimPaths.items():
+            if node not in subtreeNodes and primPath.HasPrefix(ownerPath):
+                return True
+        return False
+
+    def _executeDirtyToStage(self):
+        """
+        only re-execute the prims which are affected by the nodes changed since last execution
+        :return: stage
+        """
+        stage = self._executedStage
+        if stage is None:
+            return self._executeAllToStage()
+
+        owners = set()
+        for node in self._dirtyNodes:
+            if node not in self._allNodes or node.nodeType == 'Layer':
+                continue
+            isConnected, owner = self._getExecuteOwner(node)
+            if not isConnected:
+                continue
+            if owner is None:
+                return self._executeAllToStage()
+            owners.add(owner)
+
+        for owner in list(owners):
+            # skip the owner which is under another owner
+            upNode = self._getUpNode(owner)
+            while upNode is not None and upNode not in owners:
+                upNode = self._getUpNode(upNode)
+            if upNode is not None:
+                owners.remove(owner)
+                continue
+
+            prim, editTarget = self._executeContexts[owner]
+            if prim is not None and not prim.IsValid():
+                return self._executeAllToStage()
+            if self._hasOutsideSpecs(owner):
+                return self._executeAllToStage()
+
+        with executeBlock(stage):
+            layerNodes = self.getNodes(type='Layer')
+            layerNodes.sort(lambda n1, n2: cmp(n1.pos().y(), n2.pos().y()))
+            if (layerNodes != self._executedLayerNodes
+                    or len([n for n in layerNodes if n in self._dirtyNodes]) > 0):
+                del stage.GetRootLayer().subLayerPaths[:]
+                self._executeLayerNodes(stage, layerNodes)
+
+            if self._rootDirty:
+                self.rootNode.execute(stage, None)
+
+            for owner in owners:
+                prim, editTarget = self._executeContexts[owner]
+                with editContext(stage, editTarget):
+                    stage.RemovePrim(self._executedPrimPaths[owner])
+                    self._executeNode(owner, stage, prim)
+
+        self._dirtyNodes = set()
+        self._rootDirty = False
 
         return stage
 
@@ -652,33 +846,108 @@ class GraphicsScene(QGraphicsScene):
             self.resetScene()
 
     def reloadLayer(self):
-        self.resetScene()
-
-    def resetScene(self):
+        self.resetScene(background=True)
+
+    def resetScene(self, background=False):
+        """
+        :param background: walk the layer in a thread and create the nodes a slice of time per event loop pass,
+                           the progress is sent by loadProgressChanged and loadFinished is emitted at the end
+        """
+        self._stopLoad()
+        self._loadCancelled = False
+
+        self._highlightedPipes = set()
+        self._dirtyPipes = set()
         self.clear()
         self._primNodes = {}
         self._allNodes = {}
+        self._nodesByName = {}
+        self._nodesByType = {}
         self._nodesSuffix = {}
+        self._nodesGrid.clear()
+        self._resetExecuteState()
 
-        t = time.time()
+        self._loadStartTime = time.time()
 
         prim = self.layer.GetPrimAtPath('/')
 
         self.rootNode = self.createNode('Root')
 
         self._addLayerNodes(self.layer)
-        self._getIntoPrim(prim, self.rootNode)
+
+        self._loadTraversal = self._createTraversal()
+        self._loadNodes = []
+        if background:
+            self._loadThread = LayerTraversalThread(self._loadTraversal, prim, parent=self)
+            self._loadThread.start()
+            self._loadTimer.start(LOAD_POLL_INTERVAL)
+        else:
+            self._loadTraversal.traverse(prim)
+            self._buildNodes(self._loadTraversal, self.rootNode, self._loadNodes)
+            self._finishLoad()
+
+    def isLoading(self):
+        return self._loadTraversal is not None
+
+    def cancelLoad(self):
+        """
+        stop a background load, the nodes created until now are kept
+        """
+        if not self.isLoading():
+            return
+        self._stopLoad()
+        self._loadCancelled = True
+        logger.warning('loading cancelled, the prims not loaded will be lost if the changes are applied')
+        self._finishLoad()
+
+    def _stopLoad(self):
+        self._loadTimer.stop()
+        if self._loadTraversal is not None:
+            self._loadTraversal.cancel()
+        if self._loadThread is not None:
+            self._loadThread.wait()
+            self._loadThread = None
+
+    def _loadStep(self):
+        traversal = self._loadTraversal
+
+        if self._loadThread is not None:
+            if not self._loadThread.isFinished():
+                # busy, the number of nodes is not known until the walk is done
+                self.loadProgressChanged.emit(len(traversal.nodes), 0)
+                return
+            self._loadThread = None
+            self._loadTimer.start(0)
+
+        t = time.time()
+        total = len(traversal.nodes)
+        while len(self._loadNodes) < total and time.time() - t < LOAD_TIME_SLICE:
+            self._buildNodes(traversal, self.rootNode, self._loadNodes, count=LOAD_CHUNK_SIZE)
+        self.loadProgressChanged.emit(len(self._loadNodes), total)
+
+        if len(self._loadNodes) >= total:
+            self._loadTimer.stop()
+            self._finishLoad()
+
+    def _finishLoad(self):
+        self._loadTraversal = None
+        self._loadNodes = []
 
         # we need to connect shader nodes after all nodes are created
         self._connectShadeNodes()
 
         # self._layoutNodes()
 
-        self.view._resizeScene()
+        self._dirtyNodes = set()
+
+        if self.view is not None:
+            self.view._resizeScene()
 
-        logger.debug('resetScene time: {}'.format(time.time() - t))
+        logger.debug('resetScene time: {}'.format(time.time() - self._loadStartTime))
         logger.debug('scene node number: {}'.format(len(self.allNodes())))
 
+        self.loadFinished.emit()
+
     def createNode(self, nodeClass, name=None, **kwargs):
         # QCoreApplication.processEvents()
 
@@ -696,11 +965,15 @@ class GraphicsScene(QGraphicsScene):
             self.addItem(node)
             node.afterAddToScene()
             self._allNodes.update({node: nodeName})
+            self._nodesByName.setdefault(nodeName, []).append(node)
+            self._nodesByType.setdefault(node.nodeType, set()).add(node)
+            self._nodesGrid.insert(node, node.pos())
+            self._invalidateBatchPicture()
 
-            if suffix in self._nodesSuffix:
-                self._nodesSuffix[suffix].append(index)
-            else:
-                self._nodesSuffix[suffix] = [index]
+            node.nodeObject.parameterValueChanged.connect(self._nodeParameterValueChanged)
+            self._dirtyNodes.add(node)
+
+            self._addNameIndex(suffix, index)
 
             return node
 
@@ -722,15 +995,30 @@ class GraphicsScene(QGraphicsScene):
             self.removeItem(pipe)
 
         for node in selectedNodes:
-            for port in node.ports:
-                for pipe in port.pipes:
-                    pipe.breakConnection()
-                    self.removeItem(pipe)
-            self.removeItem(node)
-            self._allNodes.pop(node)
+            self._removeNode(node)
+
+    def _removeNode(self, node):
+        for port in node.ports:
+            for pipe in port.pipes[::]:
+                pipe.breakConnection()
+                self.removeItem(pipe)
+        self.removeItem(node)
+        nodeName = self._allNodes.pop(node)
+        self._removeNodeName(node, nodeName)
+        self._nodesByType[node.nodeType].discard(node)
+        self._nodesGrid.remove(node)
+        self._invalidateBatchPicture()
+        self._executeContexts.pop(node, None)
+        self._executedPrimPaths.pop(node, None)
 
     def frameSelection(self):
-        self.view.fitTo(self.selectedItems())
+        selectedItems = self.selectedItems()
+        for node in [n for n in selectedItems if isinstance(n, NodeItem) and n.Class() == 'Collapsed']:
+            selectedItems.remove(node)
+            for newNode in self.expandNode(node):
+                newNode.setSelected(True)
+                selectedItems.append(newNode)
+        self.view.fitTo(selectedItems)
 
     def disableSelection(self):
         for node in self.getSelectedNodes():
@@ -738,7 +1026,10 @@ class GraphicsScene(QGraphicsScene):
 
     def enterSelection(self):
         for item in self.selectedItems():
-            if isinstance(item.nodeObject, LayerNode):
+            if item.Class() == 'Collapsed':
+                self.expandNode(item)
+                return
+            elif isinstance(item.nodeObject, LayerNode):
                 self.enterLayerRequired.emit(item.parameter('layerPath').getValue())
                 return
             elif isinstance(item.nodeObject, (ReferenceNode, PayloadNode)):
@@ -746,33 +1037,131 @@ class GraphicsScene(QGraphicsScene):
                 return
 
     def updateSelectedNodesPipe(self):
-        pipes = []
+        """
+        the pipes are updated once the pending events are processed,
+        so all the mouse moves of one frame only update them once
+        """
         for node in self.getSelectedNodes():
             for port in node.ports:
-                for pipe in port.pipes:
-                    if pipe not in pipes:
-                        pipes.append(pipe)
+                self._dirtyPipes.update(port.pipes)
+        if not self._pipeUpdateTimer.isActive():
+            self._pipeUpdateTimer.start()
+
+    def _updateDirtyPipes(self):
+        pipes = self._dirtyPipes
+        self._dirtyPipes = set()
         for pipe in pipes:
-            pipe.updatePath()
+            if pipe.scene() is self:
+                pipe.updatePath()
 
     def allNodes(self):
         return self._allNodes.keys()
         # nodes = [item for item in self.items() if isinstance(item, NodeItem)]
         # return nodes
 
-    def getNode(self, nodeName):
-        nodes = self.allNodes()
-        for node in nodes:
-            if node.name() == nodeName:
-                return node
+    def _highlightConnection(self):
+        pipes = set()
+        for node in self.getSelectedNodes():
+            for port in node.ports:
+                pipes.update(port.pipes)
+
+        for pipe in self._highlightedPipes - pipes:
+            pipe.setLineColor(highlight=False)
+            pipe.update()
+        for pipe in pipes - self._highlightedPipes:
+            pipe.setLineColor(highlight=True)
+            pipe.update()
+        self._highlightedPipes = pipes
+
+    def _nodePositionChanged(self, node):
+        if self._nodesGrid.contains(node):
+            self._nodesGrid.move(node, node.pos())
+            self._invalidateBatchPicture()
+
+    def addItem(self, item):
+        super(GraphicsScene, self).addItem(item)
+        if self.lod == LOD_BATCH:
+            if isinstance(item, NodeItem):
+                item.setBatched(True)
+            elif isinstance(item, Pipe):
+                item.setFlag(QGraphicsItem.ItemHasNoContents, True)
+                self._invalidateBatchPicture()
 
-    def getNodes(self, type=None):
-        nodes = self.allNodes()
+    def setLod(self, lod):
+        if lod == self.lod:
+            return
+        batched = lod == LOD_BATCH
+        if batched != (self.lod == LOD_BATCH):
+            for node in self.allNodes():
+                node.setBatched(batched)
+                for port in node.ports:
+                    for pipe in port.pipes:
+                        pipe.setFlag(QGraphicsItem.ItemHasNoContents, batched)
+            self._invalidateBatchPicture()
+        self.lod = lod
+        self.update()
+
+    def _invalidateBatchPicture(self):
+        self._batchPicture = None
+
+    def getBatchPicture(self):
+        """
+        all nodes and pipes drawn in one picture, used when the view is zoomed far out
+        :return: QPicture
+        """
+        if self._batchPicture is not None:
+            return self._batchPicture
+
+        picture = QPicture()
+        painter = QPainter(picture)
+
+        lines = []
+        for node in self.allNodes():
+            for port in node.getOutputPorts():
+                for pipe in port.pipes:
+                    if pipe.source is not None and pipe.target is not None:
+                        lines.append(QLineF(pipe.source.scenePos(), pipe.target.scenePos()))
+        painter.setPen(QPen(VIEW_PIPE_BATCH_COLOR, 0))
+        painter.drawLines(lines)
+
+        painter.setPen(Qt.NoPen)
+        for node in self.allNodes():
+            # batched nodes are not painted, so their fillColor is not updated by setHighlight
+            if node.isSelected():
+                fillColor = node.nodeObject.fillHighlightColor
+            else:
+                fillColor = node.nodeObject.fillNormalColor
+            painter.fillRect(QRectF(node.pos().x(), node.pos().y(), node.w, node.h), fillColor)
+
+        painter.end()
+
+        self._batchPicture = picture
+        return picture
+
+    def getNodesInRect(self, rect):
+        return self._nodesGrid.query(rect)
+
+    def getNode(self, nodeName):
+        nodes = self._nodesByName.get(nodeName)
+        if nodes:
+            return nodes[0]
+
+    def getNodes(self, type=None, predicate=None):
+        """
+        :param type: node type or list of node types
+        :param predicate: function which takes a node and returns bool
+        :return: list of nodes
+        """
         if type is None:
-            return nodes
-        if not isinstance(type, (list, tuple)):
-            type = [type]
-        nodes = [n for n in nodes if n.nodeType in type]
+            nodes = self.allNodes()
+        else:
+            if not isinstance(type, (list, tuple, set)):
+                type = [type]
+            nodes = []
+            for nodeType in type:
+                nodes.extend(self._nodesByType.get(nodeType, []))
+        if predicate is not None:
+            nodes = [n for n in nodes if predicate(n)]
         return nodes
 
     def getSelectedNodes(self):
@@ -798,16 +1187,23 @@ class GraphicsScene(QGraphicsScene):
             return nodesString
 
     def pasteNodesFromString(self, nodesString):
+        """
+        :param nodesString: json of getSelectedNodesAsString, the nodes are moved to the clicked position of the view,
+                            without a view they keep their positions
+        :return: the new nodes, None if nodesString is not valid
+        """
         try:
             nodesDict = json.loads(nodesString)
         except:
             return
-        _topLeftPos = nodesDict.get('_topLeftPos', [0, 0])
-        nodesDict.pop('_topLeftPos')
+        _topLeftPos = nodesDict.pop('_topLeftPos', [0, 0])
 
-        scenePos = self.view.mapToScene(self.view.clickedPos)
-        offsetX = scenePos.x() - _topLeftPos[0]
-        offsetY = scenePos.y() - _topLeftPos[1]
+        offsetX = 0
+        offsetY = 0
+        if self.view is not None:
+            scenePos = self.view.mapToScene(self.view.clickedPos)
+            offsetX = scenePos.x() - _topLeftPos[0]
+            offsetY = scenePos.y() - _topLeftPos[1]
 
         _nameConvertDict = {}
         _newNodes = []
@@ -845,8 +1241,10 @@ class GraphicsScene(QGraphicsScene):
                     value = parameter.convertValueFromPy(value)
                     parameter.setValue(value)
                 else:
-                    for key, value in timeSamples.items():
-                        timeSamples[key] = parameter.convertValueFromPy(value)
+                    # json keys are strings, the times are floats
+                    timeSamples = dict(
+                        (float(key), parameter.convertValueFromPy(value)) for key, value in timeSamples.items()
+                    )
                     parameter.setTimeSamples(timeSamples)
 
         # connections
@@ -872,8 +1270,20 @@ class GraphicsScene(QGraphicsScene):
             node.setSelected(True)
         return _newNodes
 
+    def _canExecute(self):
+        if self.isLoading():
+            logger.warning('the layer is still loading')
+            return False
+        if self._loadCancelled:
+            logger.warning('the loading of the layer was cancelled, reload it first')
+            return False
+        return True
+
     def exportToFile(self):
-        stage = self._executeAllToStage()
+        if not self._canExecute():
+            return
+
+        stage = self._executeDirtyToStage()
 
         usdFile = self.layer.realPath
 
@@ -888,11 +1298,41 @@ class GraphicsScene(QGraphicsScene):
         print stage.GetRootLayer().ExportToString()
         stage.GetRootLayer().Export(exportFile)
 
-    def applyChanges(self):
+    def exportAllToFile(self, exportFile):
+        """
+        execute all the nodes to a new stage and export its root layer, works without a view
+        :return: the executed stage, None if it can't be executed
+        """
+        if not self._canExecute():
+            return
+
         stage = self._executeAllToStage()
+        stage.GetRootLayer().Export(exportFile)
+        return stage
+
+    def _materializeLazyParameters(self):
+        # the lazy parameters read the specs of self.layer, which is rewritten by applyChanges,
+        # and disabled or unconnected nodes are not executed, so they'd never get their parameters
+        for node in self.getNodes(type='AttributeSet'):
+            node.nodeObject.materializeParameters()
+
+    def applyChanges(self):
+        if not self._canExecute():
+            return
+
+        self._materializeLazyParameters()
+
+        stage = self._executeDirtyToStage()
+
+        t = time.time()
+
+        if APPLY_MODE == 'diff':
+            patchLayer(stage.GetRootLayer(), self.layer)
+        else:
+            layerString = stage.GetRootLayer().ExportToString()
+            self.layer.ImportFromString(layerString)
 
-        layerString = stage.GetRootLayer().ExportToString()
-        self.layer.ImportFromString(layerString)
+        logger.debug('apply time ({}): {}'.format(APPLY_MODE, time.time() - t))
 
     def setAsEditTarget(self):
         if self.stage is not None:
@@ -194,7 +194,7 @@ class UsdNodeGraph(QMainWindow):
 
         if newScene is None:
             newScene = self._addNewScene(stage, layer)
-            newScene.scene.resetScene()
+            newScene.scene.resetScene(background=True)
 
         # newScene.setStage(stage, layer)
         self.nodeGraphTab.setTabText(len(self.scenes) - 1, os.path.basename(layer.realPath))
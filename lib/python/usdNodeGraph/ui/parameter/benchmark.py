@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# __author__ = 'XingHuan'
+
+"""
+Time the value conversions of the array parameters in the register,
+the element by element conversion against the bulk (numpy) one.
+
+    python -m usdNodeGraph.ui.parameter.benchmark [size]
+"""
+
+
+import sys
+import time
+from usdNodeGraph.ui.parameter.register import ParameterRegister
+from usdNodeGraph.ui.parameter.parameter.params import _ArrayParameter
+
+
+DEFAULT_SIZE = 100000
+
+
+def _createPyValue(parameterClass, size):
+    if parameterClass._numpyDtype is None:
+        return ['item{}'.format(i) for i in range(size)]
+    if parameterClass._numpyDtype.startswith('int'):
+        element = 1
+    else:
+        element = 0.5
+    if len(parameterClass._numpyShape) > 0:
+        element = [element] * parameterClass._numpyShape[0]
+    return [element] * size
+
+
+def _timeIt(func, *args):
+    t = time.time()
+    result = func(*args)
+    return time.time() - t, result
+
+
+def benchmarkArrayParameters(size=DEFAULT_SIZE):
+    """
+    :return: list of (typeName, elementFromPy, elementToPy, bulkFromPy, bulkToPy) times,
+             the bulk times are None if numpy is not used for the type
+    """
+    results = []
+    for typeName in sorted(ParameterRegister._PARAMETER_MAP.keys()):
+        parameterClass = ParameterRegister.getParameter(typeName)
+        if not issubclass(parameterClass, _ArrayParameter):
+            continue
+
+        pyValue = _createPyValue(parameterClass, size)
+        elementFromPy, usdValue = _timeIt(parameterClass.convertElementsFromPy, pyValue)
+        elementToPy, _ = _timeIt(parameterClass.convertElementsToPy, usdValue)
+
+        bulkFromPy = None
+        bulkToPy = None
+        if parameterClass.canUseNumpy():
+            bulkFromPy, usdValue = _timeIt(parameterClass.convertValueFromPy, pyValue)
+            bulkToPy, _ = _timeIt(parameterClass.convertValueToPy, usdValue)
+
+        results.append((typeName, elementFromPy, elementToPy, bulkFromPy, bulkToPy))
+    return results
+
+
+def main(argv):
+    size = int(argv[1]) if len(argv) > 1 else DEFAULT_SIZE
+
+    def formatTime(t):
+        return '-' if t is None else '{:.4f}'.format(t)
+
+    print('size: {}'.format(size))
+    print('{:<12}{:>14}{:>14}{:>14}{:>14}'.format('type', 'elemFromPy', 'elemToPy', 'bulkFromPy', 'bulkToPy'))
+    for result in benchmarkArrayParameters(size):
+        print('{:<12}{:>14}{:>14}{:>14}{:>14}'.format(result[0], *[formatTime(t) for t in result[1:]]))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
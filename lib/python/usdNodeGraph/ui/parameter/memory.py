@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# __author__ = 'XingHuan'
+
+"""
+Measure the memory of the parameters, the slotted Parameter against the
+QObject based one it replaced (a QObject with a parameterValueChanged signal
+connected to its node, and the attributes in a __dict__).
+
+    python -m usdNodeGraph.ui.parameter.memory [count]
+"""
+
+
+import gc
+import os
+import sys
+import resource
+from usdNodeGraph.ui.parameter.parameter import FloatParameter
+
+try:
+    from usdNodeGraph.module.sqt import QObject, Signal
+except ImportError:
+    QObject = None
+
+
+DEFAULT_COUNT = 100000
+
+
+def _getMemory():
+    """
+    :return: resident memory in bytes
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (IOError, OSError):
+        # peak memory, only right if the measured part grows it
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+if QObject is not None:
+    class _BaselineNode(QObject):
+        def _paramterValueChanged(self, parameter, value):
+            pass
+
+    class _BaselineParameter(QObject):
+        parameterValueChanged = Signal(object, object)
+
+        def __init__(self, name='', value=None, parent=None):
+            super(_BaselineParameter, self).__init__()
+
+            self._name = name
+            self._label = name
+            self._order = None
+            self._node = parent
+            self._value = value
+            self._defaultValue = value
+            self._timeSamples = None
+            self._builtIn = False
+            self._visible = True
+            self._connect = None
+            self._isCustom = False
+
+            self.parameterValueChanged.connect(self._node._paramterValueChanged)
+
+
+def _measure(createFunc, count):
+    """
+    :return: bytes per created object
+    """
+    gc.collect()
+    before = _getMemory()
+    objects = [createFunc(i) for i in range(count)]
+    gc.collect()
+    after = _getMemory()
+    del objects
+    gc.collect()
+    return float(after - before) / count
+
+
+def benchmarkParameterMemory(count=DEFAULT_COUNT):
+    """
+    :return: (slottedBytes, baselineBytes) per parameter, baselineBytes is None without a Qt binding
+    """
+    baselineBytes = None
+    if QObject is not None:
+        node = _BaselineNode()
+        baselineBytes = _measure(lambda i: _BaselineParameter('param{}'.format(i), 0.0, node), count)
+
+    slottedBytes = _measure(lambda i: FloatParameter('param{}'.format(i), 0.0), count)
+
+    return slottedBytes, baselineBytes
+
+
+def main(argv):
+    count = int(argv[1]) if len(argv) > 1 else DEFAULT_COUNT
+
+    slottedBytes, baselineBytes = benchmarkParameterMemory(count)
+
+    print('count: {}'.format(count))
+    print('{:<12}{:>14}'.format('parameter', 'bytes/param'))
+    print('{:<12}{:>14}'.format('QObject', '-' if baselineBytes is None else '{:.1f}'.format(baselineBytes)))
+    print('{:<12}{:>14}'.format('slotted', '{:.1f}'.format(slottedBytes)))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
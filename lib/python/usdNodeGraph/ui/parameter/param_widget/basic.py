@@ -1,7 +1,7 @@
 from usdNodeGraph.module.sqt import *
 from ..parameter import Parameter, Vec3fParameter
 from usdNodeGraph.ui.utils.state import GraphState
-from usdNodeGraph.ui.utils.layout import clearLayout
+from usdNodeGraph.utils.timeSamples import TimeSamples, INTERPOLATION_HELD, INTERPOLATION_LINEAR
 
 
 class ParameterObject(object):
@@ -62,6 +62,11 @@ class ParameterObject(object):
         self._parameter = parameter
         self._reConnectSignal()
 
+        # the parameter is not a QObject, so the connection is not removed with the widget
+        parameterSignal = parameter.parameterValueChanged
+        slot = self._parameterValueChanged
+        self.destroyed.connect(lambda *args: parameterSignal.disconnect(slot))
+
         self.updateUI()
 
     def getParameter(self):
@@ -106,6 +111,102 @@ class ParameterObject(object):
         self._reConnectSignal()
 
 
+class ArrayTableModel(QAbstractTableModel):
+    """
+    the elements of an array parameter at one time, read when the view asks for them,
+    so only the visible rows cost anything
+    """
+    arrayEdited = Signal()
+
+    def __init__(self, parent=None):
+        super(ArrayTableModel, self).__init__(parent)
+
+        self._parameter = None
+        self._childParameterClass = None
+        self._array = []
+        self._columns = 1
+
+    def setParameter(self, parameter):
+        self._parameter = parameter
+        self._childParameterClass = parameter.getChildParamClass()
+        usdValueClass = getattr(self._childParameterClass, '_usdValueClass', None)
+        self._columns = getattr(usdValueClass, 'dimension', 1)
+
+    def getArray(self):
+        return self._array
+
+    def setArray(self, array):
+        if array is None:
+            array = []
+        if len(array) != len(self._array):
+            self.beginResetModel()
+            self._array = array
+            self.endResetModel()
+        else:
+            self._array = array
+            if len(array) > 0:
+                self.dataChanged.emit(self.index(0, 0), self.index(len(array) - 1, self._columns - 1))
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._array)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._columns
+
+    def _getElement(self, index):
+        element = self._array[index.row()]
+        if self._columns > 1:
+            return element[index.column()]
+        return element
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in [Qt.DisplayRole, Qt.EditRole]:
+            value = self._getElement(index)
+            if self._columns == 1:
+                value = self._childParameterClass.convertValueToPy(value)
+            return str(value)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Vertical:
+            return str(section)
+        return None
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        oldValue = self._getElement(index)
+        try:
+            if isinstance(oldValue, basestring):
+                newValue = str(value)
+            else:
+                newValue = type(oldValue)(str(value))
+        except ValueError:
+            return False
+
+        array = type(self._array)(self._array)
+        if self._columns > 1:
+            element = array[index.row()]
+            element[index.column()] = newValue
+            array[index.row()] = element
+        else:
+            array[index.row()] = self._childParameterClass.convertValueFromPy(newValue)
+        self._array = array
+
+        self.dataChanged.emit(index, index)
+        self.arrayEdited.emit()
+        return True
+
+
 class ArrayParameterWidget(QWidget, ParameterObject):
     def __init__(self):
         super(ArrayParameterWidget, self).__init__()
@@ -118,88 +219,53 @@ class ArrayParameterWidget(QWidget, ParameterObject):
         self.expandButton = QPushButton('expand...')
         self.expandButton.setFixedHeight(20)
 
-        self.scrollArea = QScrollArea()
-        self.scrollArea.setWidgetResizable(True)
-        self.scrollArea.setMinimumHeight(100)
-        self.scrollArea.setVisible(0)
-        self.areaWidget = None
-        self.areaLayout = None
+        self.arrayModel = ArrayTableModel(self)
+        self.tableView = QTableView()
+        self.tableView.setModel(self.arrayModel)
+        self.tableView.setMinimumHeight(100)
+        self.tableView.verticalHeader().setDefaultSectionSize(20)
+        self.tableView.horizontalHeader().setVisible(False)
+        self.tableView.horizontalHeader().setStretchLastSection(True)
+        self.tableView.setVisible(0)
 
         self.masterLayout.addWidget(self.expandButton)
-        self.masterLayout.addWidget(self.scrollArea)
+        self.masterLayout.addWidget(self.tableView)
 
-        self.editWidgets = []
-        self.lineEdits = []
         self.expanded = 0
 
         self.expandButton.clicked.connect(self._expandClicked)
+        self.arrayModel.arrayEdited.connect(self._editValueChanged)
+        GraphState.getState().currentTimeChanged.connect(self._currentTimeChanged)
 
     def _setMasterWidgetEnable(self, enable):
         self.expandButton.setVisible(enable)
-        self.scrollArea.setVisible(enable)
-
-    def _getEditWidgetClass(self):
-        return None
+        self.tableView.setVisible(enable and self.expanded)
 
     def _getChildParamterClass(self):
         return None
 
     def _expandClicked(self):
         self.expanded = 1 - self.expanded
-        if self.areaWidget is None:
-            self.areaWidget = QWidget()
-            self.areaLayout = QFormLayout()
-            self.areaWidget.setLayout(self.areaLayout)
-            self.scrollArea.setWidget(self.areaWidget)
-        if not self.expanded:
-            clearLayout(self.areaLayout)
-        self.scrollArea.setVisible(self.expanded)
+        self.tableView.setVisible(self.expanded)
         self.expandButton.setFixedHeight(7 if self.expanded else 20)
         self.updateUI()
 
-    def addEditWidget(self, index, pyValue=None, pyTimeSamples=None):
-        editWidgetClass = self._getEditWidgetClass()
-        editWidget = editWidgetClass()
-        editWidget.parameterWidget = self
-
-        if pyTimeSamples is None:
-            editWidget.setPyValue(pyValue)
-        else:
-            editWidget.setPyTimeSamples(pyTimeSamples)
-
-        editWidget.valueChanged.connect(self._editValueChanged)
+    def setParameter(self, parameter):
+        self.arrayModel.setParameter(parameter)
+        super(ArrayParameterWidget, self).setParameter(parameter)
 
-        self.editWidgets.append(editWidget)
-        self.areaLayout.addRow(str(index), editWidget)
+    def _currentTimeChanged(self, time):
+        if self._parameter.hasKey():
+            self.updateUI()
 
     def updateUI(self):
         self.setToolTip(self._parameter.name())
 
-        if self.areaLayout is not None and self.scrollArea.isVisible():
-            clearLayout(self.areaLayout)
-            self.editWidgets = []
-
-            timeSamples = self._parameter.getTimeSamples()
-            if timeSamples is not None:
-                timeSamples = self._parameter.convertTimeSamplesToPy(timeSamples)
-
-                valueNum = len(timeSamples.values()[0])
-
-                for index in range(valueNum):
-                    indexPyTimeSamples = {}
-                    for t, v in timeSamples.items():
-                        indexPyTimeSamples[t] = v[index]
-                    self.addEditWidget(index, pyTimeSamples=indexPyTimeSamples)
-            else:
-                value = self._parameter.getValue()
-                value = self._parameter.convertValueToPy(value)
-
-                for index, v in enumerate(value):
-                    self.addEditWidget(index, pyValue=v)
+        if self.expanded:
+            self.arrayModel.setArray(self._parameter.getValue(self._getCurrentTime()))
 
     def _editValueChanged(self):
-        value = [edit.getPyValue() for edit in self.editWidgets]
-        value = self._parameter.convertValueFromPy(value)
+        value = self.arrayModel.getArray()
 
         self._breakSignal()
 
@@ -214,7 +280,7 @@ class BasicWidget(object):
 
         self._isNumber = True
         self._hasKey = False
-        self._keys = {}
+        self._keys = TimeSamples()
 
     def hasKeys(self):
         return self._hasKey
@@ -231,44 +297,17 @@ class BasicWidget(object):
 
     def removeKeys(self):
         self._hasKey = False
-        self._keys = {}
+        self._keys = TimeSamples()
 
     def getKeys(self):
         return self._keys
 
     def getIntervalValue(self, time):
-        keys = self._keys.keys()
-        keys.sort()
-        if time <= keys[0]:
-            return self._keys[keys[0]]
-        elif time >= keys[-1]:
-            return self._keys[keys[-1]]
-        else:
-            beforeKey = None
-            afterKey = None
-            for k in keys:
-                if k < time:
-                    beforeKey = k
-                else:
-                    pass
-                if k > time:
-                    afterKey = k
-                else:
-                    pass
-            beforeValue = self._keys.get(beforeKey)
-            afterValue = self._keys.get(afterKey)
-            if self._isNumber:
-                value = beforeValue + (afterValue - beforeValue) * ((time - beforeKey) / (afterKey - beforeKey))
-            else:
-                value = beforeValue
-            return value
+        interpolation = INTERPOLATION_LINEAR if self._isNumber else INTERPOLATION_HELD
+        return self._keys.evaluate(time, interpolation)
 
     def getValueAt(self, time):
-        if time in self._keys:
-            value = self._keys.get(time)
-        else:
-            value = self.getIntervalValue(time)
-        return value
+        return self.getIntervalValue(time)
 
 
 class BasicLineEdit(QLineEdit, BasicWidget):
@@ -13,6 +13,37 @@ class StringParameterWidget(VecWidget, ParameterObject):
         self._setValueFromEdit()
 
 
+class LazyComboBox(QComboBox):
+    """
+    the items are added when the popup is shown first
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(LazyComboBox, self).__init__(*args, **kwargs)
+
+        self._lazyItems = ()
+
+    def setLazyItems(self, items):
+        self._lazyItems = items
+
+    def populate(self):
+        if len(self._lazyItems) == 0:
+            return
+        items = self._lazyItems
+        self._lazyItems = ()
+
+        currentText = self.currentText()
+        self.blockSignals(True)
+        existItems = set(self.itemText(i) for i in range(self.count()))
+        self.addItems([item for item in items if item not in existItems])
+        self.setCurrentIndex(self.findText(currentText))
+        self.blockSignals(False)
+
+    def showPopup(self):
+        self.populate()
+        super(LazyComboBox, self).showPopup()
+
+
 class ChooseWidget(QWidget):
     valueChanged = Signal()
 
@@ -23,7 +54,7 @@ class ChooseWidget(QWidget):
         self.masterLayout.setContentsMargins(0, 0, 0, 0)
         self.setLayout(self.masterLayout)
 
-        self._comboBox = QComboBox()
+        self._comboBox = LazyComboBox()
         self._comboBox.setEditable(True)
         self.masterLayout.addWidget(self._comboBox)
 
@@ -60,9 +91,7 @@ class ChooseParameterWidget(ChooseWidget, ParameterObject):
     def setParameter(self, parameter):
         super(ChooseParameterWidget, self).setParameter(parameter)
 
-        for value in self.getParameter().getItems():
-            if self._comboBox.findText(value) == -1:
-                self._comboBox.addItem(value)
+        self._comboBox.setLazyItems(self.getParameter().getItems())
 
     def _editIndexChanged(self):
         super(ChooseParameterWidget, self)._editIndexChanged()
@@ -3,13 +3,54 @@
 
 
 import copy
-from usdNodeGraph.module.sqt import *
+from usdNodeGraph.utils.timeSamples import TimeSamples
 
 
-class Parameter(QObject):
+class _ParameterMeta(type):
+    # parameters are created for every node, so no subclass should get a __dict__
+    def __new__(mcs, name, bases, attrs):
+        attrs.setdefault('__slots__', ())
+        return super(_ParameterMeta, mcs).__new__(mcs, name, bases, attrs)
+
+
+class _ParameterSignal(object):
+    """
+    works like the parameterValueChanged signal of a parameter,
+    the slots are kept and called by the node of the parameter
+    """
+    __slots__ = ('_parameter', )
+
+    def __init__(self, parameter):
+        self._parameter = parameter
+
+    def connect(self, slot):
+        self._parameter._node._connectParameter(self._parameter, slot)
+
+    def disconnect(self, slot):
+        self._parameter._node._disconnectParameter(self._parameter, slot)
+
+    def emit(self, parameter, value):
+        self._parameter._node._emitParameterValueChanged(parameter, value)
+
+
+class Parameter(object):
+    __metaclass__ = _ParameterMeta
+    __slots__ = (
+        '_name',
+        '_label',
+        '_order',
+        '_node',
+        '_value',
+        '_defaultValue',
+        '_timeSamples',
+        '_builtIn',
+        '_visible',
+        '_connect',
+        '_isCustom',
+    )
+
     parameterTypeString = None
     valueTypeName = None
-    parameterValueChanged = Signal(object, object)
 
     @classmethod
     def convertValueFromPy(cls, pyValue):
@@ -46,21 +87,23 @@ class Parameter(QObject):
             custom=False,
             **kwargs
     ):
-        super(Parameter, self).__init__()
-
         self._name = name
         self._label = name if label is None else label
         self._order = order
         self._node = parent
         self._value = value
         self._defaultValue = value
-        self._timeSamples = timeSamples
+        self._timeSamples = None
+        if timeSamples is not None:
+            self._timeSamples = TimeSamples(timeSamples)
         self._builtIn = builtIn
         self._visible = visible
         self._connect = None
         self._isCustom = custom
 
-        self.parameterValueChanged.connect(self._node._paramterValueChanged)
+    @property
+    def parameterValueChanged(self):
+        return _ParameterSignal(self)
 
     def hasKey(self):
         return self._timeSamples is not None
@@ -92,14 +135,24 @@ class Parameter(QObject):
             if time is None:
                 return self._timeSamples.values()[0]
             else:
-                # todo: if time not in keys?
-                return self._timeSamples.get(time)
-    
+                return self._timeSamples.evaluate(time)
+
+    def getValues(self, times):
+        """
+        the values at many times, see TimeSamples.evaluateMany
+        """
+        if not self.hasKey():
+            return [self.getValue() for time in times]
+        return self._timeSamples.evaluateMany(times)
+
     def getTimeSamples(self):
+        """
+        :return: TimeSamples, which can be used as a {time: value} dict
+        """
         return self._timeSamples
 
     def setTimeSamples(self, timeSamples, emitSignal=False):
-        self._timeSamples = timeSamples
+        self._timeSamples = None if timeSamples is None else TimeSamples(timeSamples)
         if emitSignal:
             self.parameterValueChanged.emit(self, value)
 
@@ -112,7 +165,7 @@ class Parameter(QObject):
         if self._timeSamples is None:
             self.setValue(value)
             return
-        self._timeSamples.update({time: value})
+        self._timeSamples[time] = value
         self.parameterValueChanged.emit(self, value)
 
     def setConnect(self, connect, emitSignal=True):
@@ -1,6 +1,11 @@
 from .basic import Parameter
 from pxr import Vt, Gf, Sdf
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class _StringParameter(Parameter):
     pass
@@ -39,19 +44,74 @@ class AssetParameter(_StringParameter):
             return Sdf.AssetPath(pyValue)
 
 
+class ChoiceRegistry(object):
+    """
+    immutable choice tuples shared by the ChooseParameters,
+    equal choices are interned to one tuple, and can be kept by the key of their source
+    """
+    _interned = {}
+    _choices = {}
+
+    @classmethod
+    def intern(cls, items):
+        items = tuple(items)
+        return cls._interned.setdefault(items, items)
+
+    @classmethod
+    def setChoices(cls, key, items):
+        choices = cls.intern(items)
+        cls._choices[key] = choices
+        return choices
+
+    @classmethod
+    def getChoices(cls, key, createFunc=None):
+        """
+        :param createFunc: gives the items if there are no choices of key yet
+        :return: tuple or None
+        """
+        choices = cls._choices.get(key)
+        if choices is None and createFunc is not None:
+            choices = cls.setChoices(key, createFunc())
+        return choices
+
+    @classmethod
+    def removeChoices(cls, key):
+        cls._choices.pop(key, None)
+
+    @classmethod
+    def clear(cls):
+        cls._interned = {}
+        cls._choices = {}
+
+
 class ChooseParameter(_StringParameter):
+    __slots__ = ('_items', )
     parameterTypeString = 'choose'
 
     def __init__(self, *args, **kwargs):
         super(ChooseParameter, self).__init__(*args, **kwargs)
 
-        self._items = []
+        self._items = ()
+
+    def setItems(self, items):
+        """
+        :param items: a tuple is kept without copying, so it can be shared by many parameters
+        """
+        if not isinstance(items, tuple):
+            items = ChoiceRegistry.intern(items)
+        self._items = items
+
+    def _getOwnItems(self):
+        # copied on the first add, the shared items are never changed
+        if isinstance(self._items, tuple):
+            self._items = list(self._items)
+        return self._items
 
     def addItems(self, items):
-        self._items.extend(items)
+        self._getOwnItems().extend(items)
 
     def addItem(self, item):
-        self._items.append(item)
+        self._getOwnItems().append(item)
 
     def getItems(self):
         return self._items
@@ -143,6 +203,9 @@ class Point3fParameter(_VecParamter):
 # --------------------------------------- array ----------------------------------
 class _ArrayParameter(Parameter):
     _usdValueClass = None
+    # numeric arrays are converted in bulk through numpy when it's available
+    _numpyDtype = None
+    _numpyShape = ()
 
     @classmethod
     def getChildParamType(cls):
@@ -156,15 +219,46 @@ class _ArrayParameter(Parameter):
         return paramClass
 
     @classmethod
-    def convertValueToPy(cls, usdValue):
+    def canUseNumpy(cls):
+        return numpy is not None and cls._numpyDtype is not None
+
+    @classmethod
+    def convertValueToNumpy(cls, usdValue):
+        """
+        :return: a numpy view of the Vt array (no copy), None if numpy can't be used
+        """
+        if usdValue is None or not cls.canUseNumpy():
+            return None
+        return numpy.asarray(usdValue)
+
+    @classmethod
+    def convertValueFromNumpy(cls, array):
+        array = numpy.asarray(array, dtype=cls._numpyDtype).reshape((-1, ) + cls._numpyShape)
+        return cls._usdValueClass.FromNumpy(array)
+
+    @classmethod
+    def convertElementsToPy(cls, usdValue):
         childParamClass = cls.getChildParamClass()
         return [childParamClass.convertValueToPy(i) for i in usdValue]
 
     @classmethod
-    def convertValueFromPy(cls, pyValue):
+    def convertElementsFromPy(cls, pyValue):
         childParamClass = cls.getChildParamClass()
         return cls._usdValueClass([childParamClass.convertValueFromPy(i) for i in pyValue])
 
+    @classmethod
+    def convertValueToPy(cls, usdValue):
+        array = cls.convertValueToNumpy(usdValue)
+        if array is not None:
+            return array.tolist()
+        return cls.convertElementsToPy(usdValue)
+
+    @classmethod
+    def convertValueFromPy(cls, pyValue):
+        if pyValue is not None and cls.canUseNumpy():
+            return cls.convertValueFromNumpy(pyValue)
+        return cls.convertElementsFromPy(pyValue)
+
 
 class StringArrayParameter(_ArrayParameter):
     parameterTypeString = 'string[]'
@@ -176,6 +270,7 @@ class IntArrayParameter(_ArrayParameter):
     parameterTypeString = 'int[]'
     valueTypeName = Sdf.ValueTypeNames.IntArray
     _usdValueClass = Vt.IntArray
+    _numpyDtype = 'int32'
 
 
 class TokenArrayParameter(_ArrayParameter):
@@ -188,58 +283,76 @@ class FloatArrayParameter(_ArrayParameter):
     parameterTypeString = 'float[]'
     valueTypeName = Sdf.ValueTypeNames.FloatArray
     _usdValueClass = Vt.FloatArray
+    _numpyDtype = 'float32'
 
 
 class DoubleArrayParameter(_ArrayParameter):
     parameterTypeString = 'double[]'
     valueTypeName = Sdf.ValueTypeNames.DoubleArray
     _usdValueClass = Vt.DoubleArray
+    _numpyDtype = 'float64'
 
 
 class Vec2fArrayParameter(_ArrayParameter):
     parameterTypeString = 'float2[]'
     valueTypeName = Sdf.ValueTypeNames.Float2Array
     _usdValueClass = Vt.Vec2fArray
+    _numpyDtype = 'float32'
+    _numpyShape = (2, )
 
 
 class Vec3fArrayParameter(_ArrayParameter):
     parameterTypeString = 'float3[]'
     valueTypeName = Sdf.ValueTypeNames.Float3Array
     _usdValueClass = Vt.Vec3fArray
+    _numpyDtype = 'float32'
+    _numpyShape = (3, )
 
 
 class Vec4fArrayParameter(_ArrayParameter):
     parameterTypeString = 'float4[]'
     valueTypeName = Sdf.ValueTypeNames.Float4Array
     _usdValueClass = Vt.Vec4fArray
+    _numpyDtype = 'float32'
+    _numpyShape = (4, )
 
 
 class Vec2dArrayParameter(_ArrayParameter):
     parameterTypeString = 'double2[]'
     valueTypeName = Sdf.ValueTypeNames.Double2Array
     _usdValueClass = Vt.Vec2dArray
+    _numpyDtype = 'float64'
+    _numpyShape = (2, )
 
 
 class Vec3dArrayParameter(_ArrayParameter):
     parameterTypeString = 'double3[]'
     valueTypeName = Sdf.ValueTypeNames.Double3Array
     _usdValueClass = Vt.Vec3dArray
+    _numpyDtype = 'float64'
+    _numpyShape = (3, )
 
 
 class Vec4dArrayParameter(_ArrayParameter):
     parameterTypeString = 'double4[]'
     valueTypeName = Sdf.ValueTypeNames.Double4Array
     _usdValueClass = Vt.Vec4dArray
+    _numpyDtype = 'float64'
+    _numpyShape = (4, )
 
 
 class Color3fArrayParameter(_ArrayParameter):
     parameterTypeString = 'color3f[]'
     valueTypeName = Sdf.ValueTypeNames.Color3fArray
     _usdValueClass = Vt.Vec3fArray
+    _numpyDtype = 'float32'
+    _numpyShape = (3, )
 
 
 class Point3fArrayParameter(_ArrayParameter):
     parameterTypeString = 'point3f[]'
     valueTypeName = Sdf.ValueTypeNames.Point3fArray
     _usdValueClass = Vt.Vec3fArray
+    _numpyDtype = 'float32'
+    _numpyShape = (3, )
 
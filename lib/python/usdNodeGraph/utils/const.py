@@ -10,4 +10,7 @@ OUTPUT_ATTRIBUTE_PREFIX = 'outputs:'
 
 
 VIEWPORT_FULL_UPDATE = os.environ.get('USD_NODEGRAPH_VIEWPORT_FULL_UPDATE', '0')
-
+VIEWPORT_OPENGL = os.environ.get('USD_NODEGRAPH_VIEWPORT_OPENGL', '0')
+LAZY_POPULATE = os.environ.get('USD_NODEGRAPH_LAZY_POPULATE', '0')
+EXECUTE_BACKEND = os.environ.get('USD_NODEGRAPH_EXECUTE_BACKEND', 'usd')
+APPLY_MODE = os.environ.get('USD_NODEGRAPH_APPLY_MODE', 'diff')
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+# __author__ = 'XingHuan'
+
+"""
+Author the differences of two layers spec by spec, so only the changed prims
+get recomposed by the stages which use the destination layer.
+"""
+
+
+from pxr import Sdf
+
+
+# fields which are handled by the children walking
+_SKIP_INFO_KEYS = [
+    'subLayers',
+    'subLayerOffsets',
+    'primChildren',
+    'properties',
+    'variantSetChildren',
+    'variantChildren',
+    'targetChildren',
+    'connectionChildren',
+]
+
+
+def _patchInfo(srcSpec, dstSpec):
+    srcKeys = [k for k in srcSpec.ListInfoKeys() if k not in _SKIP_INFO_KEYS]
+    dstKeys = [k for k in dstSpec.ListInfoKeys() if k not in _SKIP_INFO_KEYS]
+
+    for key in dstKeys:
+        if key not in srcKeys:
+            dstSpec.ClearInfo(key)
+    for key in srcKeys:
+        value = srcSpec.GetInfo(key)
+        if key not in dstKeys or dstSpec.GetInfo(key) != value:
+            dstSpec.SetInfo(key, value)
+
+
+def _patchSubLayers(srcLayer, dstLayer):
+    srcSubLayers = list(zip(srcLayer.subLayerPaths, srcLayer.subLayerOffsets))
+    dstSubLayers = list(zip(dstLayer.subLayerPaths, dstLayer.subLayerOffsets))
+    if srcSubLayers == dstSubLayers:
+        return
+
+    del dstLayer.subLayerPaths[:]
+    for index, (layerPath, layerOffset) in enumerate(srcSubLayers):
+        dstLayer.subLayerPaths.append(layerPath)
+        dstLayer.subLayerOffsets[index] = layerOffset
+
+
+def _patchProperties(srcLayer, srcSpec, dstLayer, dstSpec):
+    srcProperties = srcSpec.properties
+    dstProperties = dstSpec.properties
+
+    for name in list(dstProperties.keys()):
+        dstProperty = dstProperties[name]
+        srcProperty = srcProperties.get(name)
+        if srcProperty is None or type(srcProperty) is not type(dstProperty):
+            dstSpec.RemoveProperty(dstProperty)
+
+    for name, srcProperty in srcProperties.items():
+        dstProperty = dstSpec.properties.get(name)
+        if dstProperty is None:
+            Sdf.CopySpec(srcLayer, srcProperty.path, dstLayer, srcProperty.path)
+        else:
+            _patchInfo(srcProperty, dstProperty)
+
+
+def _patchVariantSets(srcLayer, srcSpec, dstLayer, dstSpec):
+    srcVariantSets = srcSpec.variantSets
+    dstVariantSets = dstSpec.variantSets
+
+    for name in list(dstVariantSets.keys()):
+        if name not in srcVariantSets:
+            dstSpec.RemoveVariantSet(name)
+
+    for name, srcVariantSet in srcVariantSets.items():
+        dstVariantSet = dstSpec.variantSets.get(name)
+        if dstVariantSet is None:
+            Sdf.CopySpec(srcLayer, srcVariantSet.path, dstLayer, srcVariantSet.path)
+            continue
+
+        srcVariants = srcVariantSet.variants
+        for variantName in list(dstVariantSet.variants.keys()):
+            if variantName not in srcVariants:
+                dstVariantSet.RemoveVariant(dstVariantSet.variants[variantName])
+        for variantName, srcVariant in srcVariants.items():
+            dstVariant = dstVariantSet.variants.get(variantName)
+            if dstVariant is None:
+                Sdf.CopySpec(srcLayer, srcVariant.path, dstLayer, srcVariant.path)
+            else:
+                _patchInfo(srcVariant, dstVariant)
+                _patchPrim(srcLayer, srcVariant.primSpec, dstLayer, dstVariant.primSpec)
+
+
+def _patchPrim(srcLayer, srcSpec, dstLayer, dstSpec):
+    _patchInfo(srcSpec, dstSpec)
+    _patchProperties(srcLayer, srcSpec, dstLayer, dstSpec)
+    _patchVariantSets(srcLayer, srcSpec, dstLayer, dstSpec)
+
+    srcChildren = srcSpec.nameChildren
+    dstChildren = dstSpec.nameChildren
+
+    for name in list(dstChildren.keys()):
+        if name not in srcChildren:
+            dstSpec.RemoveNameChild(dstChildren[name])
+
+    for name, srcChild in srcChildren.items():
+        dstChild = dstSpec.nameChildren.get(name)
+        if dstChild is None:
+            Sdf.CopySpec(srcLayer, srcChild.path, dstLayer, srcChild.path)
+        else:
+            _patchPrim(srcLayer, srcChild, dstLayer, dstChild)
+
+
+def patchLayer(srcLayer, dstLayer):
+    """
+    make dstLayer the same as srcLayer, only the changed fields are authored,
+    all in one Sdf.ChangeBlock.
+    :param srcLayer: Sdf.Layer
+    :param dstLayer: Sdf.Layer
+    :return:
+    """
+    with Sdf.ChangeBlock():
+        _patchSubLayers(srcLayer, dstLayer)
+        _patchPrim(srcLayer, srcLayer.pseudoRoot, dstLayer, dstLayer.pseudoRoot)
@@ -5,10 +5,19 @@
 
 import os
 import sys
+from collections import OrderedDict
 from usdNodeGraph.module.sqt import *
 
 RES_FOLDER = '/'.join(__file__.replace('\\', '/').split('/')[:-3]) + '/resource'
 
+# pixmaps are shared by (path, scale, aspect, color, clip), the least recently used is dropped
+PIXMAP_CACHE_SIZE = 256
+# the scaled images before coloring, so an icon in another color is not loaded and scaled again
+IMAGE_CACHE_SIZE = 64
+
+_pixmapCache = OrderedDict()
+_imageCache = OrderedDict()
+
 
 def get_pic(*args):
     path = os.path.join(RES_FOLDER, *args).replace('\\', '/')
@@ -19,9 +28,27 @@ def get_qicon(*args):
     return QIcon(get_pic(*args))
 
 
+def clear_pixmap_cache():
+    _pixmapCache.clear()
+    _imageCache.clear()
+
+
+def _cache_get(cache, key):
+    value = cache.pop(key, None)
+    if value is not None:
+        cache[key] = value
+    return value
+
+
+def _cache_set(cache, key, value, size):
+    if len(cache) >= size:
+        cache.popitem(last=False)
+    cache[key] = value
+
+
 def get_pixmap(*args, **kwargs):
     """
-    return QPixmap object based on name and scale
+    return QPixmap object based on name and scale, the pixmaps are cached
     :param name: pic name
     :param scale: scale factor, list or int
     :return: QPixmap
@@ -59,6 +86,23 @@ def get_pixmap(*args, **kwargs):
         if not is_enabled:
             widget.setEnabled(is_enabled)
 
+    if clip and isinstance(clip, (list, tuple)):
+        clip = tuple(clip)
+    else:
+        clip = None
+
+    imageKey = (path, (scale.width(), scale.height()) if scale else None, aspect)
+    key = imageKey + (color.rgba() if color else None, clip)
+    pixmap = _cache_get(_pixmapCache, key)
+    if pixmap is None:
+        pixmap = _create_pixmap(imageKey, path, scale, aspect, color, clip)
+        _cache_set(_pixmapCache, key, pixmap, PIXMAP_CACHE_SIZE)
+
+    # implicitly shared, the cached one is not changed if the returned one is painted on
+    return QPixmap(pixmap)
+
+
+def _load_image(path, scale, aspect):
     img = QImage(path)
 
     if scale:
@@ -70,24 +114,42 @@ def get_pixmap(*args, **kwargs):
             img = img.scaledToWidth(scale.width(), Qt.SmoothTransformation)
         elif aspect == 'height':
             img = img.scaledToHeight(scale.height(), Qt.SmoothTransformation)
+    return img
+
+
+def _color_image(img, color):
+    """
+    set the rgb of every pixel to color, keeping the alpha
+    """
+    if img.depth() in [1, 8] and img.colorCount() > 0:
+        img = img.copy()
+        for index in range(img.colorCount()):
+            src_color = QColor.fromRgba(img.color(index))
+            img.setColor(index, QColor(color.red(), color.green(), color.blue(),
+                                       src_color.alpha()).rgba())
+        return img
+
+    # composed in bulk by Qt, the source alpha is kept and the rgb replaced
+    img = img.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+    painter = QPainter(img)
+    painter.setCompositionMode(QPainter.CompositionMode_SourceIn)
+    painter.fillRect(img.rect(), QColor(color.red(), color.green(), color.blue()))
+    painter.end()
+    return img
+
+
+def _create_pixmap(imageKey, path, scale, aspect, color, clip):
+    img = _cache_get(_imageCache, imageKey)
+    if img is None:
+        img = _load_image(path, scale, aspect)
+        _cache_set(_imageCache, imageKey, img, IMAGE_CACHE_SIZE)
+
     if color:
-        img = img.convertToFormat(QImage.Format_Indexed8)
-        if img.depth() in [1, 8]:
-            for index in range(img.colorCount()):
-                src_color = QColor.fromRgba(img.color(index))
-                img.setColor(index, QColor(color.red(), color.green(), color.blue(),
-                                                 src_color.alpha()).rgba())
-        else:
-            for row in range(img.height()):
-                for col in range(img.width()):
-                    src_color = QColor.fromRgba(img.pixel(col, row))
-                    if not src_color.alpha():
-                        continue
-                    img.setPixel(col, row, color.rgb())
+        img = _color_image(img, color)
 
     pixmap = QPixmap.fromImage(img)
 
-    if clip and isinstance(clip, (list, tuple)):
+    if clip:
         pixmap = pixmap.copy(*clip)
 
     return pixmap
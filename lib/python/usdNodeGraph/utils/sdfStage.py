@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+# __author__ = 'XingHuan'
+
+"""
+A small subset of the Usd.Stage/Usd.Prim api which authors straight into a Sdf.Layer,
+so the nodes can be executed without stage recomposition.
+"""
+
+
+from pxr import Usd, Sdf
+
+
+class _NullBlock(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+def executeBlock(stage):
+    """
+    all the edits of a SdfStage can be done in one Sdf.ChangeBlock,
+    a Usd.Stage must not be queried inside a change block.
+    :param stage:
+    :return: context manager
+    """
+    if isinstance(stage, SdfStage):
+        return Sdf.ChangeBlock()
+    return _NullBlock()
+
+
+class _EditContext(object):
+    def __init__(self, stage, editTarget):
+        self._stage = stage
+        self._editTarget = editTarget
+        self._oldEditTarget = None
+
+    def __enter__(self):
+        self._oldEditTarget = self._stage.GetEditTarget()
+        self._stage.SetEditTarget(self._editTarget)
+        return self
+
+    def __exit__(self, *args):
+        self._stage.SetEditTarget(self._oldEditTarget)
+        return False
+
+
+def editContext(stage, editTarget):
+    """
+    like Usd.EditContext, but also works for SdfStage
+    """
+    return _EditContext(stage, editTarget)
+
+
+class SdfStage(object):
+    @classmethod
+    def CreateInMemory(cls):
+        return cls(Sdf.Layer.CreateAnonymous('.usda'))
+
+    def __init__(self, layer):
+        self._layer = layer
+        self._editTarget = Usd.EditTarget(layer)
+
+    def GetRootLayer(self):
+        return self._layer
+
+    def GetEditTarget(self):
+        return self._editTarget
+
+    def SetEditTarget(self, editTarget):
+        self._editTarget = editTarget
+
+    def GetPseudoRoot(self):
+        return SdfPrim(self, Sdf.Path.absoluteRootPath)
+
+    def GetPrimAtPath(self, path):
+        return SdfPrim(self, Sdf.Path(path))
+
+    def OverridePrim(self, path):
+        prim = SdfPrim(self, Sdf.Path(path))
+        prim._getSpec(create=True)
+        return prim
+
+    def DefinePrim(self, path, typeName=''):
+        prim = self.OverridePrim(path)
+        prim.SetSpecifier(Sdf.SpecifierDef)
+        if typeName != '':
+            prim.SetTypeName(typeName)
+        return prim
+
+    def RemovePrim(self, path):
+        specPath = self._editTarget.MapToSpecPath(Sdf.Path(path))
+        primSpec = self._editTarget.GetLayer().GetPrimAtPath(specPath)
+        if primSpec is None:
+            return False
+        parentSpec = self._editTarget.GetLayer().GetPrimAtPath(specPath.GetParentPath())
+        parentSpec.RemoveNameChild(primSpec)
+        return True
+
+    def SetMetadata(self, key, value):
+        self._layer.pseudoRoot.SetInfo(key, value)
+        return True
+
+    def GetMetadata(self, key):
+        return self._layer.pseudoRoot.GetInfo(key)
+
+    def ExportToString(self):
+        return self._layer.ExportToString()
+
+
+class SdfPrim(object):
+    def __init__(self, stage, path):
+        self._stage = stage
+        self._path = path
+
+    def _getSpecPath(self):
+        return self._stage.GetEditTarget().MapToSpecPath(self._path)
+
+    def _getLayer(self):
+        return self._stage.GetEditTarget().GetLayer()
+
+    def _getSpec(self, create=False):
+        if self._path == Sdf.Path.absoluteRootPath:
+            return self._getLayer().pseudoRoot
+        specPath = self._getSpecPath()
+        if create:
+            return Sdf.CreatePrimInLayer(self._getLayer(), specPath)
+        return self._getLayer().GetPrimAtPath(specPath)
+
+    def GetStage(self):
+        return self._stage
+
+    def GetPath(self):
+        return self._path
+
+    def GetName(self):
+        return self._path.name
+
+    def IsValid(self):
+        return True
+
+    def SetSpecifier(self, specifier):
+        self._getSpec(create=True).specifier = specifier
+        return True
+
+    def SetTypeName(self, typeName):
+        self._getSpec(create=True).typeName = typeName
+        return True
+
+    def SetMetadata(self, key, value):
+        self._getSpec(create=True).SetInfo(key, value)
+        return True
+
+    def GetMetadata(self, key):
+        spec = self._getSpec()
+        if spec is not None and spec.HasInfo(key):
+            return spec.GetInfo(key)
+
+    def GetReferences(self):
+        return _SdfReferences(self)
+
+    def SetPayload(self, payload):
+        self._getSpec(create=True).payloadList.explicitItems = [payload]
+        return True
+
+    def _hasProperty(self, name, viewName):
+        spec = self._getSpec()
+        return spec is not None and name in getattr(spec, viewName)
+
+    def HasAttribute(self, name):
+        return self._hasProperty(name, 'attributes')
+
+    def GetAttribute(self, name):
+        return SdfAttribute(self, name)
+
+    def CreateAttribute(self, name, typeName, custom=True):
+        spec = self._getSpec(create=True)
+        if name not in spec.attributes:
+            Sdf.AttributeSpec(spec, name, typeName, Sdf.VariabilityVarying, custom)
+        return SdfAttribute(self, name)
+
+    def HasRelationship(self, name):
+        return self._hasProperty(name, 'relationships')
+
+    def GetRelationship(self, name):
+        return SdfRelationship(self, name)
+
+    def CreateRelationship(self, name, custom=True):
+        spec = self._getSpec(create=True)
+        if name not in spec.relationships:
+            Sdf.RelationshipSpec(spec, name, custom)
+        return SdfRelationship(self, name)
+
+    def GetVariantSets(self):
+        return _SdfVariantSets(self)
+
+    def GetVariantSet(self, variantSetName):
+        return SdfVariantSet(self, variantSetName)
+
+
+class _SdfReferences(object):
+    def __init__(self, prim):
+        self._prim = prim
+
+    def SetReferences(self, references):
+        self._prim._getSpec(create=True).referenceList.explicitItems = references
+        return True
+
+    def AddReference(self, reference):
+        self._prim._getSpec(create=True).referenceList.Prepend(reference)
+        return True
+
+
+class _SdfProperty(object):
+    _specViewName = None
+
+    def __init__(self, prim, name):
+        self._prim = prim
+        self._name = name
+
+    def _getSpec(self):
+        return getattr(self._prim._getSpec(create=True), self._specViewName)[self._name]
+
+    def GetName(self):
+        return self._name
+
+    def GetPath(self):
+        return self._prim.GetPath().AppendProperty(self._name)
+
+    def SetCustom(self, custom):
+        self._getSpec().custom = custom
+        return True
+
+
+class SdfAttribute(_SdfProperty):
+    _specViewName = 'attributes'
+
+    def Set(self, value, time=None):
+        if time is None or time == Usd.TimeCode.Default():
+            self._getSpec().default = value
+        else:
+            spec = self._getSpec()
+            spec.layer.SetTimeSample(spec.path, time, value)
+        return True
+
+    def SetConnections(self, connections):
+        self._getSpec().connectionPathList.explicitItems = [Sdf.Path(c) for c in connections]
+        return True
+
+
+class SdfRelationship(_SdfProperty):
+    _specViewName = 'relationships'
+
+    def SetTargets(self, targets):
+        self._getSpec().targetPathList.explicitItems = [Sdf.Path(t) for t in targets]
+        return True
+
+
+class _SdfVariantSets(object):
+    def __init__(self, prim):
+        self._prim = prim
+
+    def AddVariantSet(self, variantSetName):
+        primSpec = self._prim._getSpec(create=True)
+        if variantSetName not in primSpec.variantSets:
+            Sdf.VariantSetSpec(primSpec, variantSetName)
+        if variantSetName not in primSpec.variantSetNameList.prependedItems:
+            primSpec.variantSetNameList.Prepend(variantSetName)
+        return SdfVariantSet(self._prim, variantSetName)
+
+
+class SdfVariantSet(object):
+    def __init__(self, prim, variantSetName):
+        self._prim = prim
+        self._name = variantSetName
+
+    def GetName(self):
+        return self._name
+
+    def AddVariant(self, variantName):
+        primSpec = self._prim._getSpec(create=True)
+        variantSetSpec = primSpec.variantSets.get(self._name)
+        if variantSetSpec is None:
+            variantSetSpec = Sdf.VariantSetSpec(primSpec, self._name)
+        if variantName not in variantSetSpec.variants:
+            Sdf.VariantSpec(variantSetSpec, variantName)
+        return True
+
+    def GetVariantSelection(self):
+        primSpec = self._prim._getSpec()
+        if primSpec is None:
+            return ''
+        return primSpec.variantSelections.get(self._name, '')
+
+    def SetVariantSelection(self, variantName):
+        self._prim._getSpec(create=True).variantSelections[self._name] = variantName
+        return True
+
+    def GetVariantEditContext(self):
+        stage = self._prim.GetStage()
+        variantPath = self._prim._getSpecPath().AppendVariantSelection(self._name, self.GetVariantSelection())
+        editTarget = Usd.EditTarget.ForLocalDirectVariant(stage.GetEditTarget().GetLayer(), variantPath)
+        return editContext(stage, editTarget)
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+# __author__ = 'XingHuan'
+
+"""
+Time samples kept in sorted arrays, looked up with bisect and interpolated
+like Usd does: held before the first and after the last sample, held or
+linear between two samples. Like Usd, only the floating point types are
+interpolated, the others (int, bool, string, int vectors and arrays) are held.
+"""
+
+
+import re
+import bisect
+from pxr import Gf
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+INTERPOLATION_HELD = 'held'
+INTERPOLATION_LINEAR = 'linear'
+
+_QUAT_TYPES = (Gf.Quath, Gf.Quatf, Gf.Quatd)
+
+# the Gf / Vt types of floating point values, e.g. Vec3f, Matrix4d, Quath, DoubleArray, Vec3fArray
+_LINEAR_TYPE_NAME_PATTERN = re.compile(r'^(Half|Float|Double|Vec[234][hfd]|Matrix[234][fd]|Quat[hfd])(Array)?$')
+
+
+def canInterpolate(value):
+    if isinstance(value, float):
+        return True
+    return _LINEAR_TYPE_NAME_PATTERN.match(type(value).__name__) is not None
+
+
+def lerp(value1, value2, alpha):
+    """
+    :return: the linear interpolated value, or value1 when the type is held
+    """
+    if not canInterpolate(value1):
+        return value1
+    if isinstance(value1, _QUAT_TYPES):
+        return Gf.Slerp(alpha, value1, value2)
+    if hasattr(value1, '__len__') and len(value1) != len(value2):
+        # arrays of different size are held
+        return value1
+    if type(value1).__name__.startswith('Quat'):
+        # quaternion array
+        return type(value1)([Gf.Slerp(alpha, q1, q2) for q1, q2 in zip(value1, value2)])
+    try:
+        return value1 + (value2 - value1) * alpha
+    except TypeError:
+        pass
+    if numpy is not None and hasattr(type(value1), 'FromNumpy'):
+        array1 = numpy.asarray(value1)
+        array2 = numpy.asarray(value2)
+        return type(value1).FromNumpy(array1 + (array2 - array1) * alpha)
+    return value1
+
+
+class TimeSamples(object):
+    """
+    works like the {time: value} dict which it's created from
+    """
+    __slots__ = ('_times', '_values', 'interpolation')
+
+    def __init__(self, timeSamples=None, interpolation=INTERPOLATION_LINEAR):
+        self.interpolation = interpolation
+        items = sorted(timeSamples.items()) if timeSamples is not None else []
+        self._times = [t for t, v in items]
+        self._values = [v for t, v in items]
+
+    def _index(self, time):
+        index = bisect.bisect_left(self._times, time)
+        if index < len(self._times) and self._times[index] == time:
+            return index
+        return -1
+
+    def __len__(self):
+        return len(self._times)
+
+    def __contains__(self, time):
+        return self._index(time) != -1
+
+    def __iter__(self):
+        return iter(self._times)
+
+    def __getitem__(self, time):
+        index = self._index(time)
+        if index == -1:
+            raise KeyError(time)
+        return self._values[index]
+
+    def __setitem__(self, time, value):
+        index = bisect.bisect_left(self._times, time)
+        if index < len(self._times) and self._times[index] == time:
+            self._values[index] = value
+        else:
+            self._times.insert(index, time)
+            self._values.insert(index, value)
+
+    def __eq__(self, other):
+        if isinstance(other, TimeSamples):
+            return self._times == other._times and self._values == other._values
+        if isinstance(other, dict):
+            return self.toDict() == other
+        return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def get(self, time, default=None):
+        index = self._index(time)
+        if index == -1:
+            return default
+        return self._values[index]
+
+    def pop(self, time, *args):
+        index = self._index(time)
+        if index == -1:
+            if args:
+                return args[0]
+            raise KeyError(time)
+        self._times.pop(index)
+        return self._values.pop(index)
+
+    def update(self, timeSamples):
+        for time, value in timeSamples.items():
+            self[time] = value
+
+    def keys(self):
+        return list(self._times)
+
+    def values(self):
+        return list(self._values)
+
+    def items(self):
+        return zip(self._times, self._values)
+
+    def toDict(self):
+        return dict(self.items())
+
+    def evaluate(self, time, interpolation=None):
+        """
+        :param time: any time, not only the sample times
+        :return: the value at time, O(log n)
+        """
+        if len(self._times) == 0:
+            return None
+        index = bisect.bisect_right(self._times, time)
+        if index == 0:
+            return self._values[0]
+        if index == len(self._times) or self._times[index - 1] == time:
+            return self._values[index - 1]
+
+        interpolation = interpolation or self.interpolation
+        if interpolation == INTERPOLATION_HELD:
+            return self._values[index - 1]
+
+        time1 = self._times[index - 1]
+        time2 = self._times[index]
+        alpha = float(time - time1) / (time2 - time1)
+        return lerp(self._values[index - 1], self._values[index], alpha)
+
+    def evaluateMany(self, times, interpolation=None):
+        """
+        evaluate at many times at once, with numpy the floating point samples
+        (scalars, Gf vectors and matrices, Vt arrays of the same size) are interpolated as one array
+        :return: list of values, or a numpy array of shape (len(times), ...) when numpy is used
+        """
+        interpolation = interpolation or self.interpolation
+        array = self._asNumpy()
+        if array is None:
+            return [self.evaluate(time, interpolation) for time in times]
+
+        times = numpy.asarray(times, dtype=float)
+        sampleTimes = numpy.asarray(self._times, dtype=float)
+        index = numpy.clip(numpy.searchsorted(sampleTimes, times, side='right'), 1, len(sampleTimes) - 1)
+        time1 = sampleTimes[index - 1]
+        time2 = sampleTimes[index]
+        alpha = numpy.clip((times - time1) / (time2 - time1), 0.0, 1.0)
+        if interpolation == INTERPOLATION_HELD:
+            alpha = (alpha >= 1.0).astype(float)
+        alpha = alpha.reshape((-1, ) + (1, ) * (array.ndim - 1))
+        value1 = array[index - 1]
+        value2 = array[index]
+        return value1 + (value2 - value1) * alpha
+
+    def _asNumpy(self):
+        if numpy is None or len(self._times) < 2:
+            return None
+        # held types are evaluated one by one, and quaternions are not interpolated by component
+        value = self._values[0]
+        if not canInterpolate(value) or type(value).__name__.startswith('Quat'):
+            return None
+        try:
+            array = numpy.asarray([numpy.asarray(v) for v in self._values])
+        except (TypeError, ValueError):
+            return None
+        if array.dtype.kind != 'f':
+            return None
+        return array.astype(float)